@@ -0,0 +1,69 @@
+"""
+Compare the catalog parsers of get_northeastern_course_info on the saved
+catalog fixtures: check that every mode gives exactly the same output as the
+default html.parser mode, and time them.
+
+Usage:
+    python benchmarks/bench_catalog_parsing.py [--repeat 5] [files ...]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from netscitools.neu_courses import get_northeastern_course_info, iter_northeastern_course_info
+
+try:
+    import lxml.html  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "catalog", "*.html")
+
+MODES = {
+    "default (html.parser)": lambda html: get_northeastern_course_info(html),
+    "fast": lambda html: get_northeastern_course_info(html, fast=True),
+    "fast, lxml": lambda html: list(iter_northeastern_course_info(html, parser="lxml")),
+    "fast, html.parser": lambda html: list(iter_northeastern_course_info(html, parser="html.parser")),
+    "fast, cached": lambda html: get_northeastern_course_info(html, fast=True, cache=True),
+}
+
+
+def best_time(function, html, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(html)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(FIXTURES))
+    print("{:<12} {:>8} {:<24} {:>10} {:>8}  {}".format("file", "courses", "mode", "ms", "speedup", "same output"))
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        expected = get_northeastern_course_info(html)
+        baseline = None
+        for mode, function in MODES.items():
+            if "lxml" in mode and not HAS_LXML:
+                continue
+            same = function(html) == expected
+            seconds = best_time(function, html, args.repeat)
+            baseline = baseline or seconds
+            print("{:<12} {:>8} {:<24} {:>10.2f} {:>7.1f}x  {}".format(
+                os.path.basename(path), len(expected), mode, 1000 * seconds, baseline / seconds, same))
+            if not same:
+                raise SystemExit("{}: {} output differs from the default parser".format(path, mode))
+
+
+if __name__ == "__main__":
+    main()
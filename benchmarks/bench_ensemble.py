@@ -0,0 +1,58 @@
+"""
+Scaling of null_model_ensemble with the number of worker processes.
+
+Usage:
+    python benchmarks/bench_ensemble.py [--nodes 2000] [--n-samples 64] [--n-jobs 1 2 4 8]
+
+Runs the same ensemble (same seed, so the same randomizations) with each
+n_jobs and prints the time, the speedup over the first n_jobs (1 by
+default) and the parallel efficiency (speedup per added process), which
+should stay close to 1 up to the number of physical cores. Use --csr to
+share the graph through shared memory instead of pickling it to the
+workers.
+"""
+
+import argparse
+import os
+import time
+
+import networkx as nx
+
+from netscitools.csr import CSRGraph
+from netscitools.ensemble import null_model_ensemble
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_jobs = [1]
+    while default_jobs[-1] * 2 <= cpus:
+        default_jobs.append(default_jobs[-1] * 2)
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--m", type=int, default=5, help="edges per new node (Barabasi-Albert)")
+    parser.add_argument("--n-samples", type=int, default=64)
+    parser.add_argument("--n-jobs", type=int, nargs="+", default=default_jobs)
+    parser.add_argument("--csr", action="store_true", help="pass the graph as a CSRGraph")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    G = nx.barabasi_albert_graph(args.nodes, args.m, seed=args.seed)
+    if args.csr:
+        G = CSRGraph.from_networkx(G)
+    print("N = {}, M = {}, n_samples = {}, CPUs = {}".format(G.number_of_nodes(), G.number_of_edges(), args.n_samples, cpus))
+    print("{:>8} {:>12} {:>10} {:>12}".format("n_jobs", "seconds", "speedup", "efficiency"))
+
+    reference = None  # (n_jobs, seconds) of the first row
+    for n_jobs in args.n_jobs:
+        start = time.perf_counter()
+        null_model_ensemble(G, n_samples=args.n_samples, n_jobs=n_jobs, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = (n_jobs, elapsed)
+        speedup = reference[1] / elapsed
+        print("{:>8} {:>12.3f} {:>10.2f} {:>12.2f}".format(n_jobs, elapsed, speedup, speedup * reference[0] / n_jobs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Startup cost of netscitools: import time and peak memory of a fresh process.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 10]
+
+Each statement runs in a new interpreter (so nothing is cached in
+sys.modules). The time is measured inside the child around the statement;
+the peak resident set size (ru_maxrss) covers the whole child process, and
+the "python" row is the interpreter alone for reference. With lazy imports,
+`import netscitools` should cost about as much as the bare interpreter, and
+numpy / networkx / bs4 are only loaded by the names that need them. The
+"core only" rows hide bs4 and lxml, as on an install without the
+"scraping" extra; the script exits with status 1 if any statement fails.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "python": "pass",
+    "import netscitools": "import netscitools",
+    "compare_decimal_places": "from netscitools import compare_decimal_places",
+    "degree_distribution": "from netscitools import degree_distribution",
+    "get_northeastern_course_info": "from netscitools import get_northeastern_course_info; get_northeastern_course_info('', fast=True)",
+    "from netscitools import *": "from netscitools import *",
+    # Core install (numpy, networkx) without the "scraping" extra: the
+    # optional modules are made unimportable
+    "core only: import *": "sys.modules.update(dict.fromkeys(OPTIONAL)); from netscitools import *",
+    "core only: PrerequisiteGraph": "sys.modules.update(dict.fromkeys(OPTIONAL)); from netscitools import PrerequisiteGraph",
+}
+
+# Dependencies of the "scraping" extra (and the former pandas dependency)
+OPTIONAL = ["bs4", "lxml", "lxml.html", "pandas"]
+
+CHILD = """
+import resource, sys, time, json
+OPTIONAL = {optional!r}
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in kilobytes on Linux, bytes on macOS
+if sys.platform == "darwin":
+    maxrss //= 1024
+heavy = sorted(name for name in ("numpy", "networkx", "bs4", "pandas", "lxml") if sys.modules.get(name) is not None)
+print(json.dumps({{"seconds": elapsed, "maxrss_kb": maxrss, "loaded": heavy}}))
+"""
+
+
+def run(statement, env):
+    process = subprocess.run(
+        [sys.executable, "-c", CHILD.format(statement=statement, optional=OPTIONAL)],
+        capture_output=True, text=True, env=env,
+    )
+    if process.returncode:
+        # Last line of the traceback, e.g. "ModuleNotFoundError: ..."
+        return {"error": process.stderr.strip().splitlines()[-1]}
+    return json.loads(process.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    # Import the package from this checkout when it is not installed
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+
+    print("{:<30} {:>10} {:>14}  {}".format("statement", "ms", "peak RSS (MB)", "heavy modules loaded"))
+    failed = False
+    for name, statement in STATEMENTS.items():
+        results = [run(statement, env) for _ in range(args.repeat)]
+        if "error" in results[0]:
+            print("{:<30} FAILED: {}".format(name, results[0]["error"]))
+            failed = True
+            continue
+        ms = 1000 * statistics.median(result["seconds"] for result in results)
+        rss = statistics.median(result["maxrss_kb"] for result in results) / 1024
+        print("{:<30} {:>10.1f} {:>14.1f}  {}".format(name, ms, rss, ", ".join(results[-1]["loaded"]) or "-"))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
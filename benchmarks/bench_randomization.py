@@ -0,0 +1,41 @@
+"""
+Scaling of degree_preserving_randomization with the number of iterations.
+
+Usage:
+    python benchmarks/bench_randomization.py [--nodes 100000] [--engine array]
+
+The time per iteration should stay roughly constant as n_iter grows for the
+"array" engine. The "networkx" engine rebuilds its edge list every iteration,
+so keep --nodes small when benchmarking it.
+"""
+
+import argparse
+import time
+
+import networkx as nx
+
+from netscitools.network import degree_preserving_randomization
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--m", type=int, default=5, help="edges per new node (Barabasi-Albert)")
+    parser.add_argument("--engine", default="array", choices=["array", "networkx"])
+    parser.add_argument("--n-iter", type=int, nargs="+", default=[10**4, 10**5, 10**6])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    G = nx.barabasi_albert_graph(args.nodes, args.m, seed=args.seed)
+    print("N = {}, M = {}, engine = {}".format(G.number_of_nodes(), G.number_of_edges(), args.engine))
+    print("{:>12} {:>12} {:>16}".format("n_iter", "seconds", "us / iteration"))
+
+    for n_iter in args.n_iter:
+        start = time.perf_counter()
+        degree_preserving_randomization(G, n_iter=n_iter, engine=args.engine, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        print("{:>12} {:>12.3f} {:>16.2f}".format(n_iter, elapsed, 1e6 * elapsed / n_iter))
+
+
+if __name__ == "__main__":
+    main()
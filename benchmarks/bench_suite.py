@@ -0,0 +1,209 @@
+"""
+Benchmark and regression suite for the network tools and the catalog parser.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1e3 1e4 1e5] [--graphs er ba powerlaw]
+                                     [--only degree] [--output results.json]
+                                     [--baseline baseline.json] [--threshold 0.25]
+
+Every function is run on seeded synthetic graphs (see graphs.py: Erdos-Renyi,
+Barabasi-Albert and power-law configuration model) of each size in edges,
+given as a CSRGraph and, up to --max-networkx-edges, as a networkx graph,
+and on the saved catalog pages in fixtures/catalog. For each benchmark the
+best time of --repeat runs is recorded, and the peak memory allocated during
+one more run (tracemalloc, which includes numpy arrays). The full range
+is --sizes 1e3 1e4 1e5 1e6 1e7; 1e7 needs several GB of memory.
+
+Everything runs offline on the CPU. To catch regressions, save the results
+of a reference run and compare later runs on the same machine against it:
+
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json
+
+The exit status is 1 if any benchmark is slower, or allocates more, than the
+baseline by more than --threshold (relative), ignoring differences below
+--min-seconds and --min-bytes.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+import numpy as np
+
+import netscitools
+from netscitools import (
+    CSRGraph, bfs, degree_distribution, degree_preserving_randomization, describe_network, dfs, iter_bfs,
+    get_northeastern_course_info,
+)
+from graphs import GENERATORS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "catalog", "*.html")
+
+
+def _consume(iterator):
+    for _ in iterator:
+        pass
+
+
+# Benchmarks on graphs: name -> (input kinds, max edges or None, function of
+# the graph). Limits keep the slow code paths to sizes that finish.
+GRAPH_BENCHMARKS = {
+    "degree_distribution": (("csr", "networkx"), None, lambda G: degree_distribution(G)),
+    "describe_network": (("csr", "networkx"), None, lambda G: describe_network(G, formatter=False, cache=False)),
+    "randomization[array]": (
+        ("csr", "networkx"), None,
+        lambda G: degree_preserving_randomization(G, n_iter=G.number_of_edges(), engine="array", seed=0),
+    ),
+    "randomization[networkx]": (
+        ("networkx",), 10 ** 4,
+        lambda G: degree_preserving_randomization(G, n_iter=100, engine="networkx", seed=0),
+    ),
+    "bfs": (("csr", "networkx"), None, lambda G: bfs([0], {0: 0}, G, verbose=False)),
+    "dfs": (("csr", "networkx"), None, lambda G: dfs([0], {0: 0}, G, verbose=False)),
+    "iter_bfs": (("csr", "networkx"), None, lambda G: _consume(iter_bfs(G, 0))),
+}
+
+CATALOG_BENCHMARKS = {
+    "get_northeastern_course_info": lambda html: get_northeastern_course_info(html),
+    "get_northeastern_course_info[fast]": lambda html: get_northeastern_course_info(html, fast=True),
+}
+
+
+def size_label(size):
+    # 1000 -> "1e3", 25000 -> "25000"
+    exponent = len(str(size)) - 1
+    return "1e{}".format(exponent) if size == 10 ** exponent else str(size)
+
+
+def measure(function, repeat):
+    """Best time of `repeat` runs, and peak traced memory of one more run."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_bytes": peak}
+
+
+def iter_benchmarks(args):
+    """Yield (key, function) for every selected benchmark."""
+    for graph_name in args.graphs:
+        for size in args.sizes:
+            inputs = {}
+            for name, (kinds, max_edges, function) in GRAPH_BENCHMARKS.items():
+                for kind in kinds:
+                    if max_edges is not None and size > max_edges:
+                        continue
+                    if kind == "networkx" and size > args.max_networkx_edges:
+                        continue
+                    key = "{}/{}/{}/{}".format(name, kind, graph_name, size_label(size))
+                    if args.only and not any(pattern in key for pattern in args.only):
+                        continue
+                    if kind not in inputs:
+                        if "csr" not in inputs:
+                            num_nodes, edges = GENERATORS[graph_name](size, seed=args.seed)
+                            inputs["csr"] = CSRGraph.from_edges(num_nodes, edges)
+                        if kind == "networkx":
+                            inputs["networkx"] = inputs["csr"].to_networkx()
+                    G = inputs[kind]
+                    yield key, lambda function=function, G=G: function(G)
+
+    for path in sorted(glob.glob(FIXTURES)):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        for name, function in CATALOG_BENCHMARKS.items():
+            key = "{}/{}".format(name, os.path.basename(path))
+            if args.only and not any(pattern in key for pattern in args.only):
+                continue
+            yield key, lambda function=function, html=html: function(html)
+
+
+def compare(results, baseline, threshold, min_seconds, min_bytes):
+    """Print the change of every benchmark against the baseline; return the regressions."""
+    regressions = []
+    print()
+    print("{:<60} {:>10} {:>10}".format("compared to baseline", "time", "memory"))
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        old = baseline[key]
+        changes = []
+        for field, floor in (("seconds", min_seconds), ("peak_bytes", min_bytes)):
+            ratio = result[field] / old[field] if old[field] else float("inf")
+            changes.append("{:+.0%}".format(ratio - 1) if np.isfinite(ratio) else "new")
+            if result[field] - old[field] > floor and ratio > 1 + threshold:
+                regressions.append((key, field, old[field], result[field]))
+                changes[-1] += " !"
+        print("{:<60} {:>10} {:>10}".format(key, *changes))
+    missing = sorted(set(baseline) - set(results))
+    if missing:
+        print("{} benchmarks of the baseline were not run".format(len(missing)))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1e3, 1e4, 1e5], help="numbers of edges")
+    parser.add_argument("--graphs", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--only", nargs="+", help="run the benchmarks whose key contains one of these strings")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-networkx-edges", type=float, default=1e5)
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown counted as a regression")
+    parser.add_argument("--min-seconds", type=float, default=1e-3)
+    parser.add_argument("--min-bytes", type=float, default=1 << 20)
+    args = parser.parse_args()
+    args.sizes = [int(size) for size in args.sizes]
+
+    print("{:<60} {:>12} {:>14}".format("benchmark", "seconds", "peak MB"))
+    results = {}
+    for key, function in iter_benchmarks(args):
+        # describe_network and friends print; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[key] = measure(function, args.repeat)
+        print("{:<60} {:>12.4f} {:>14.1f}".format(key, results[key]["seconds"], results[key]["peak_bytes"] / 2 ** 20), flush=True)
+
+    if args.output:
+        meta = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "networkx": nx.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "netscitools": os.path.dirname(netscitools.__file__),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_seconds, args.min_bytes)
+        for key, field, old, new in regressions:
+            print("REGRESSION {} {}: {:.4g} -> {:.4g}".format(key, field, old, new))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Generate the synthetic catalog pages in benchmarks/fixtures/catalog/.
+
+The pages follow the structure of https://catalog.northeastern.edu/course-descriptions/<dept>/
+that get_northeastern_course_info relies on (a large page shell with
+navigation, then div#col-content > div.sc_sccoursedescs > div.courseblock),
+with seeded random content so that the files can be regenerated exactly:
+
+    python benchmarks/fixtures/make_catalog_fixtures.py
+"""
+
+import os
+import random
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WORDS = ("network graph analysis systems design theory methods data models "
+         "introduction advanced topics laboratory seminar research practice "
+         "students course offers covers emphasizes applications principles").split()
+
+DEPARTMENTS = {
+    # code: (number of courses, other departments used as prerequisites)
+    "chme": (60, ["MATH", "PHYS", "CHEM"]),
+    "spns": (40, []),
+    "math": (250, ["CS"]),
+}
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+def code(course_id):
+    return course_id.replace(" ", "&#160;")
+
+def prerequisite_links(rng, candidates):
+    links = []
+    for course_id in rng.sample(candidates, min(len(candidates), rng.randint(1, 4))):
+        links.append('<a href="/search/?P={}" title="{}" class="bubblelink code" onclick="return showCourse(this, \'{}\');">{}</a>'.format(
+            course_id.replace(" ", "%20"), code(course_id), course_id, code(course_id)))
+        links.append(rng.choice([" or ", " and ", "; ", " (Undergraduate) or "]))
+    return "(" + "".join(links[:-1]) + ")"
+
+def courseblock(rng, course_id, candidates):
+    title = "{}.  {}.  ({} Hours)".format(code(course_id), sentence(rng, 4).rstrip("."), rng.choice([1, 2, 4]))
+    extras = ['<p class="courseblockextra noindent"><strong>Attribute(s): </strong>NUpath {}</p>'.format(rng.choice(["Natural/Designed World", "Formal/Quant Reasoning", "Writing Intensive"]))]
+    if candidates and rng.random() < 0.7:
+        extras.append('<p class="courseblockextra noindent"><strong>Prerequisite(s): </strong>{}</p>'.format(prerequisite_links(rng, candidates)))
+    if candidates and rng.random() < 0.2:
+        extras.append('<p class="courseblockextra noindent"><strong>Corequisite(s): </strong>{}</p>'.format(prerequisite_links(rng, candidates)))
+    rng.shuffle(extras)
+    return ('<div class="courseblock">\n<p class="courseblocktitle noindent"><strong>{}</strong></p>\n'
+            '<p class="cb_desc">{}</p>\n{}\n</div>\n').format(title, " ".join(sentence(rng, 12) for _ in range(4)), "\n".join(extras))
+
+def page(rng, department, num_courses, other_departments):
+    upper = department.upper()
+    numbers = sorted(rng.sample(range(1000, 7999), num_courses))
+    course_ids = ["{} {}".format(upper, number) for number in numbers]
+    external = ["{} {}".format(other, rng.randint(1000, 4999)) for other in other_departments for _ in range(10)]
+    if department == "spns":
+        # Placement courses that list themselves, and a two-course cycle, as on the real SPNS page
+        blocks = [courseblock(rng, course_id, [course_id]) for course_id in course_ids[:4]]
+        blocks.append(courseblock(rng, "SPNS 3602", ["SPNS 3603"]))
+        blocks.append(courseblock(rng, "SPNS 3603", ["SPNS 3602"]))
+        course_ids = course_ids[4:]
+    else:
+        blocks = []
+    for i, course_id in enumerate(course_ids):
+        blocks.append(courseblock(rng, course_id, course_ids[:i] + external))
+
+    navigation = "\n".join('<li><a href="/course-descriptions/{0}/">{1} ({0})</a></li>'.format(
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(4)), sentence(rng, 3)) for _ in range(150))
+    return """<!doctype html>
+<html lang="en"><head><meta charset="utf-8"><title>{upper} | Northeastern University Academic Catalog</title>
+<script>var config = {{"search": true}};</script><link rel="stylesheet" href="/css/screen.css"></head>
+<body><header id="header"><nav id="navigation"><ul>{navigation}</ul></nav></header>
+<div id="wrapper"><aside id="col-nav"><ul>{navigation}</ul></aside>
+<main id="col-content"><h1 class="page-title">{upper}</h1>
+<div class="sc_sccoursedescs">
+{blocks}</div>
+</main></div>
+<footer id="footer"><p>{footer}</p></footer></body></html>
+""".format(upper=upper, navigation=navigation, blocks="".join(blocks), footer=sentence(rng, 40)).replace('<main id="col-content">', '<div id="col-content">').replace("</main>", "</div>")
+
+def main():
+    for department, (num_courses, other_departments) in DEPARTMENTS.items():
+        rng = random.Random(department)
+        path = os.path.join(HERE, "catalog", department + ".html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page(rng, department, num_courses, other_departments))
+        print(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Seeded synthetic graphs for the benchmarks, generated with numpy so that
+graphs of 10^7 edges can be built in seconds (networkx generators are too
+slow at that size).
+
+Every generator returns `(num_nodes, edges)`, with `edges` an (m, 2) int64
+array of simple undirected edges (no self-loops, no multi-edges), and gives
+the same graph for the same arguments on any machine.
+"""
+
+import numpy as np
+
+
+def _simple_edges(num_nodes, u, v):
+    # Drop self-loops and multi-edges, keeping the first occurrence
+    u, v = np.minimum(u, v), np.maximum(u, v)
+    keep = u != v
+    u, v = u[keep], v[keep]
+    _, first = np.unique(u * num_nodes + v, return_index=True)
+    first.sort()
+    return np.column_stack([u[first], v[first]])
+
+
+def erdos_renyi(num_edges, average_degree=10, seed=0):
+    """G(n, m) random graph with n = 2 m / average_degree nodes."""
+    rng = np.random.default_rng(seed)
+    num_nodes = max(2, int(round(2 * num_edges / average_degree)))
+    num_edges = min(num_edges, num_nodes * (num_nodes - 1) // 2)
+    edges = np.empty((0, 2), dtype=np.int64)
+    while len(edges) < num_edges:
+        k = int(1.1 * (num_edges - len(edges))) + 16
+        pairs = rng.integers(0, num_nodes, size=(k, 2), dtype=np.int64)
+        edges = _simple_edges(num_nodes, np.concatenate([edges[:, 0], pairs[:, 0]]), np.concatenate([edges[:, 1], pairs[:, 1]]))
+    return num_nodes, edges[:num_edges]
+
+
+def barabasi_albert(num_edges, m=5, seed=0):
+    """
+    Barabasi-Albert preferential attachment: every new node attaches to m
+    distinct existing nodes chosen proportionally to their degree.
+    """
+    rng = np.random.default_rng(seed)
+    num_nodes = max(m + 1, num_edges // m + m)
+    edges = np.empty((m * (num_nodes - m), 2), dtype=np.int64)
+    # Every endpoint of every edge so far: sampling from it is sampling
+    # proportionally to degree
+    endpoints = np.empty(2 * len(edges), dtype=np.int64)
+    filled = 0
+    uniform = rng.random(4 * m * 1024)
+    position = 0
+
+    targets = list(range(m))  # the first new node attaches to nodes 0..m-1
+    row = 0
+    for node in range(m, num_nodes):
+        edges[row:row + m, 0] = node
+        edges[row:row + m, 1] = targets
+        row += m
+        endpoints[filled:filled + m] = targets
+        endpoints[filled + m:filled + 2 * m] = node
+        filled += 2 * m
+
+        chosen = set()
+        while len(chosen) < m:
+            if position == len(uniform):
+                uniform = rng.random(len(uniform))
+                position = 0
+            chosen.add(int(endpoints[int(uniform[position] * filled)]))
+            position += 1
+        targets = list(chosen)
+    return num_nodes, edges[:num_edges]
+
+
+def powerlaw_configuration(num_edges, exponent=2.5, min_degree=2, seed=0):
+    """
+    Erased configuration model with a power-law degree sequence
+    P(k) ~ k^-exponent, k >= min_degree, capped at sqrt(2 m). Self-loops and
+    multi-edges are erased and the edges, in random order, are trimmed to
+    exactly num_edges; if too few are left, the degrees are drawn again for
+    5% more nodes. Nodes can be left isolated.
+    """
+    rng = np.random.default_rng(seed)
+    max_degree = max(min_degree, int(np.sqrt(2 * num_edges)))
+    # Mean degree of the capped distribution, to pick the number of nodes
+    k = np.arange(min_degree, max_degree + 1, dtype=float)
+    pk = k ** -exponent
+    mean_degree = (k * pk).sum() / pk.sum()
+    num_nodes = max(2, int(round(2 * num_edges / mean_degree)))
+
+    while True:
+        degrees = rng.choice(k.astype(np.int64), size=num_nodes, p=pk / pk.sum())
+        if degrees.sum() % 2:
+            degrees[0] += 1
+        stubs = rng.permutation(np.repeat(np.arange(num_nodes, dtype=np.int64), degrees))
+        edges = _simple_edges(num_nodes, stubs[0::2], stubs[1::2])
+        if len(edges) >= num_edges:
+            return num_nodes, edges[:num_edges]
+        num_nodes = int(num_nodes * 1.05) + 1
+
+
+GENERATORS = {
+    "er": erdos_renyi,
+    "ba": barabasi_albert,
+    "powerlaw": powerlaw_configuration,
+}
@@ -1,3 +1,54 @@
-from .util import *
-from .neu_courses import *
-from .network import *
\ No newline at end of file
+"""
+Network Science Tools.
+
+Submodules are imported on first use (PEP 562), so `import netscitools`
+does not load numpy, networkx or BeautifulSoup until a name that needs them
+is accessed. `from netscitools import *` still imports everything.
+"""
+
+import importlib
+
+# Public name -> submodule defining it (the submodule's __all__)
+_EXPORTS = {
+    "compare_decimal_places": "util",
+    "get_northeastern_course_info": "neu_courses",
+    "iter_northeastern_course_info": "neu_courses",
+    "create_course_prerequisite_network": "neu_courses",
+    "PrerequisiteGraph": "neu_courses",
+    "fetch_northeastern_catalog": "neu_catalog",
+    "get_northeastern_departments": "neu_catalog",
+    "CatalogCache": "neu_catalog",
+    "CSRGraph": "csr",
+    "CSRSharedHandle": "csr",
+    "describe_network": "network",
+    "network_metrics": "network",
+    "degree_distribution": "network",
+    "degree_distribution_from_edgelist": "network",
+    "edgelist_degrees": "network",
+    "degree_preserving_randomization": "network",
+    "EdgeSwapRandomizer": "network",
+    "SwapStats": "network",
+    "dfs": "network",
+    "bfs": "network",
+    "iter_dfs": "network",
+    "iter_bfs": "network",
+    "path_length_distribution": "network",
+    "null_model_ensemble": "ensemble",
+    "RunningStats": "ensemble",
+}
+
+_SUBMODULES = ["util", "neu_courses", "neu_catalog", "csr", "network", "ensemble"]
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+        globals()[name] = value  # later lookups skip __getattr__
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
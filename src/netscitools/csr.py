@@ -0,0 +1,314 @@
+__all__ = ["CSRGraph", "CSRSharedHandle"]
+
+import json
+import pickle
+from contextlib import contextmanager
+
+import networkx as nx
+import numpy as np
+
+# File layout: magic, header length (uint64), JSON header, then the arrays
+# at 64-byte aligned offsets, then the pickled node labels (if any)
+_MAGIC = b"NSCSR\x01\x00\x00"
+_ALIGNMENT = 64
+
+def _index_dtype(n):
+    return np.int32 if n < 2 ** 31 else np.int64
+
+def _csr_from_edges(num_nodes, rows, cols):
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+    return indptr, cols[order].astype(_index_dtype(num_nodes))
+
+class CSRGraph:
+    """
+    Read-only graph in compressed sparse row (CSR) form.
+
+    Nodes are the integers 0, ..., n-1. The neighbors of node i are
+    `indices[indptr[i]:indptr[i+1]]` (successors for directed graphs; an
+    undirected edge is stored in both rows). `labels[i]` is the original
+    label of node i, e.g. the networkx node it was built from.
+
+    Compared to a networkx graph, a CSRGraph takes a few bytes per edge, can
+    be saved to a file and memory-mapped back (`save`, `load`), and can be
+    placed in shared memory so that worker processes attach to it without
+    copying (`shared_memory`, `CSRSharedHandle.attach`). The functions in
+    `netscitools.network` accept it in place of a networkx graph; nodes are
+    then reported as integer ids.
+
+    Parameters
+    ----------
+    indptr : np.ndarray
+        Row pointers, of length n + 1.
+
+    indices : np.ndarray
+        Column indices (neighbor ids), of length indptr[-1].
+
+    Both arrays are made read-only (`flags.writeable = False`).
+
+    directed : bool, optional (default=False)
+        Whether the graph is directed.
+
+    labels : list or None, optional (default=None)
+        Node labels; None means the labels are the ids themselves.
+
+    Example
+    -------
+    >>> C = CSRGraph.from_networkx(nx.karate_club_graph())
+    >>> C.save("karate.csr")
+    >>> C = CSRGraph.load("karate.csr")  # memory-mapped
+    >>> degree_distribution(C)
+    """
+
+    def __init__(self, indptr, indices, directed=False, labels=None):
+        self.indptr = np.asarray(indptr)
+        self.indices = np.asarray(indices)
+        self.indptr.flags.writeable = False
+        self.indices.flags.writeable = False
+        self.directed = directed
+        self._labels = None if labels is None else list(labels)
+        self._label_index = None
+        self._reverse = None
+        self._buffers = []  # keeps shared memory segments alive
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Build a CSRGraph from a (non-multi) networkx graph."""
+        if G.is_multigraph():
+            raise nx.NetworkXNotImplemented("not implemented for multigraph type")
+        nodes = list(G.nodes())
+        node_index = {node: i for i, node in enumerate(nodes)}
+        # Rows follow the networkx adjacency, keeping its neighbor order
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter((len(nbrs) for nbrs in G.adj.values()), dtype=np.int64, count=len(nodes)), out=indptr[1:])
+        indices = np.fromiter(
+            (node_index[v] for nbrs in G.adj.values() for v in nbrs),
+            dtype=_index_dtype(len(nodes)),
+            count=int(indptr[-1]),
+        )
+        labels = None if nodes == list(range(len(nodes))) else nodes
+        return cls(indptr, indices, directed=G.is_directed(), labels=labels)
+
+    @classmethod
+    def from_edges(cls, num_nodes, edges, directed=False, labels=None):
+        """
+        Build a CSRGraph from an (m, 2) array of integer edges. Undirected
+        edges are given once, in either orientation.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        rows, cols = edges[:, 0], edges[:, 1]
+        if not directed:
+            # Store both orientations, self-loops once (as networkx does)
+            not_loop = rows != cols
+            rows, cols = np.concatenate([rows, cols[not_loop]]), np.concatenate([cols, rows[not_loop]])
+        indptr, indices = _csr_from_edges(num_nodes, rows, cols)
+        return cls(indptr, indices, directed=directed, labels=labels)
+
+    def to_networkx(self):
+        """Convert to a networkx Graph or DiGraph with the original labels."""
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        labels = self.labels
+        G.add_nodes_from(labels)
+        G.add_edges_from((labels[u], labels[v]) for u, v in self.edges().tolist())
+        return G
+
+    @property
+    def labels(self):
+        """Node labels, indexed by node id."""
+        if self._labels is None:
+            return range(self.number_of_nodes())
+        return self._labels
+
+    def index_of(self, label):
+        """Node id of a node label."""
+        if self._labels is None:
+            return label
+        if self._label_index is None:
+            self._label_index = {node: i for i, node in enumerate(self._labels)}
+        return self._label_index[label]
+
+    def number_of_nodes(self):
+        return len(self.indptr) - 1
+
+    def number_of_edges(self):
+        if self.directed:
+            return len(self.indices)
+        return (len(self.indices) + self.number_of_selfloops()) // 2
+
+    def number_of_selfloops(self):
+        return int(np.count_nonzero(self._rows() == self.indices))
+
+    def is_directed(self):
+        return self.directed
+
+    def is_multigraph(self):
+        return False
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    def __contains__(self, node):
+        return isinstance(node, (int, np.integer)) and 0 <= node < self.number_of_nodes()
+
+    def neighbors(self, node):
+        """Neighbor ids (successors for directed graphs) of a node id."""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def _rows(self):
+        # Row id of every entry of `indices`
+        return np.repeat(np.arange(self.number_of_nodes()), np.diff(self.indptr))
+
+    def edges(self):
+        """Edges as an (m, 2) array of node ids; (u, v) with u <= v if undirected."""
+        rows = self._rows()
+        if self.directed:
+            mask = slice(None)
+        else:
+            mask = rows <= self.indices
+        return np.column_stack([rows[mask], self.indices[mask].astype(np.int64)])
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    def in_degree(self):
+        if not self.directed:
+            return self.out_degree()
+        return np.bincount(self.indices, minlength=self.number_of_nodes())
+
+    def degree(self):
+        """Degree of every node, as an array; self-loops count twice, as in networkx."""
+        if self.directed:
+            return self.out_degree() + self.in_degree()
+        rows = self._rows()
+        loops = rows[rows == self.indices]
+        return self.out_degree() + np.bincount(loops, minlength=self.number_of_nodes())
+
+    def reverse(self):
+        """The graph with all edges reversed (cached; the graph itself if undirected)."""
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            indptr, indices = _csr_from_edges(self.number_of_nodes(), self.indices.astype(np.int64), self._rows())
+            self._reverse = CSRGraph(indptr, indices, directed=True, labels=self._labels)
+        return self._reverse
+
+    def save(self, path):
+        """
+        Save to a binary file that `CSRGraph.load` can memory-map. Node
+        labels, if any, are stored pickled.
+        """
+        arrays = {"indptr": np.ascontiguousarray(self.indptr), "indices": np.ascontiguousarray(self.indices)}
+        labels = b"" if self._labels is None else pickle.dumps(self._labels, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # The header size depends on the offsets, which depend on the header
+        # size: reserve enough room for the offsets and round up
+        header = {"directed": self.directed, "arrays": {}, "labels": None}
+        offset = 0
+        for name, array in arrays.items():
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": array.shape, "offset": offset}
+            offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+        if labels:
+            header["labels"] = {"offset": offset, "size": len(labels)}
+        header_size = -(-(len(_MAGIC) + 8 + len(json.dumps(header)) + 256) // _ALIGNMENT) * _ALIGNMENT
+        for spec in header["arrays"].values():
+            spec["offset"] += header_size
+        if labels:
+            header["labels"]["offset"] += header_size
+        header_bytes = json.dumps(header).encode()
+
+        with open(path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(np.uint64(len(header_bytes)).tobytes())
+            f.write(header_bytes)
+            for name, array in arrays.items():
+                f.seek(header["arrays"][name]["offset"])
+                f.write(array.tobytes())
+            if labels:
+                f.seek(header["labels"]["offset"])
+                f.write(labels)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a graph written by `save`. With mmap=True (default), the arrays
+        are read-only memory maps of the file and are paged in on demand.
+        """
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError("{} is not a CSRGraph file".format(path))
+            header_size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_size))
+            labels = None
+            if header["labels"] is not None:
+                f.seek(header["labels"]["offset"])
+                labels = pickle.loads(f.read(header["labels"]["size"]))
+
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+            if mmap and shape[0] > 0:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=spec["offset"], shape=shape)
+            else:
+                with open(path, "rb") as f:
+                    f.seek(spec["offset"])
+                    arrays[name] = np.fromfile(f, dtype=dtype, count=shape[0])
+        return cls(arrays["indptr"], arrays["indices"], directed=header["directed"], labels=labels)
+
+    @contextmanager
+    def shared_memory(self):
+        """
+        Context manager that copies the arrays into `multiprocessing`
+        shared memory and yields a small, picklable `CSRSharedHandle`. Pass
+        the handle to worker processes and call `handle.attach()` there. The
+        shared memory is released when the block exits.
+
+        >>> with C.shared_memory() as handle:
+        ...     with ProcessPoolExecutor(initializer=init, initargs=(handle,)) as executor:
+        ...         ...
+        """
+        from multiprocessing import shared_memory  # Python >= 3.8
+
+        segments = []
+        specs = {}
+        try:
+            for name in ("indptr", "indices"):
+                array = np.ascontiguousarray(getattr(self, name))
+                segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                segments.append(segment)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[:] = array
+                specs[name] = (segment.name, array.dtype.str, array.shape)
+            yield CSRSharedHandle(specs, self.directed, self._labels)
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+class CSRSharedHandle:
+    """
+    Picklable reference to a CSRGraph in shared memory, created by
+    `CSRGraph.shared_memory()`. Only the segment names (and node labels, if
+    any) are pickled; `attach()` maps the arrays without copying.
+    """
+
+    def __init__(self, specs, directed, labels):
+        self.specs = specs
+        self.directed = directed
+        self.labels = labels
+
+    def attach(self):
+        """Return a CSRGraph backed by the shared memory segments."""
+        from multiprocessing import shared_memory  # Python >= 3.8
+
+        arrays = {}
+        segments = []
+        for name, (segment_name, dtype, shape) in self.specs.items():
+            try:
+                segment = shared_memory.SharedMemory(name=segment_name, track=False)
+            except TypeError:  # Python < 3.13
+                segment = shared_memory.SharedMemory(name=segment_name)
+            segments.append(segment)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+        G = CSRGraph(arrays["indptr"], arrays["indices"], directed=self.directed, labels=self.labels)
+        G._buffers = segments
+        return G
@@ -0,0 +1,218 @@
+__all__ = ["null_model_ensemble", "RunningStats"]
+
+import os
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import networkx as nx
+import numpy as np
+
+from .csr import CSRGraph
+from .network import EdgeSwapRandomizer, _transitivity
+
+class RunningStats:
+    """
+    Streaming mean and variance of a vector of statistics (Welford's
+    algorithm). Partial results computed elsewhere, e.g. in worker processes,
+    can be combined with `merge()` without keeping the individual samples.
+
+    Parameters
+    ----------
+    size : int
+        Number of statistics tracked side by side.
+    """
+
+    def __init__(self, size):
+        self.count = 0
+        self.mean = np.zeros(size)
+        self._m2 = np.zeros(size)
+
+    def update(self, values):
+        """Add one sample (a sequence of `size` values)."""
+        values = np.asarray(values, dtype=float)
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (values - self.mean)
+
+    def merge(self, other):
+        """Add all samples summarized by another RunningStats in place."""
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / count
+        self._m2 = self._m2 + other._m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def var(self):
+        """Sample variance (ddof=1); NaN with fewer than 2 samples."""
+        if self.count < 2:
+            return np.full_like(self.mean, np.nan)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+def _degree_assortativity(G):
+    # nx.degree_assortativity_coefficient, also for CSRGraph: Pearson
+    # correlation of the degrees at both ends of the edges (out-degree of
+    # the source and in-degree of the target for directed graphs)
+    if not isinstance(G, CSRGraph):
+        return nx.degree_assortativity_coefficient(G)
+    edges = G.edges()
+    if G.directed:
+        x, y = G.out_degree()[edges[:, 0]], G.in_degree()[edges[:, 1]]
+    else:
+        degree = G.degree()
+        x = np.concatenate([degree[edges[:, 0]], degree[edges[:, 1]]])
+        y = np.concatenate([degree[edges[:, 1]], degree[edges[:, 0]]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.corrcoef(x, y)[0, 1])
+
+# Graph shipped once to each worker process by the pool initializer (or
+# attached from shared memory for a CSRGraph)
+_worker_graph = None
+
+def _init_worker(G):
+    global _worker_graph
+    if hasattr(G, "attach"):
+        G = G.attach()
+    _worker_graph = G
+
+def _run_chunk(seeds, n_iter, statistics):
+    stats = RunningStats(len(statistics))
+    for seed in seeds:
+        randomizer = EdgeSwapRandomizer(_worker_graph, seed=seed).run(n_iter)
+        if isinstance(_worker_graph, CSRGraph):
+            G_random = randomizer.to_csr()
+        else:
+            G_random = randomizer.to_networkx()
+        stats.update([statistic(G_random) for statistic in statistics])
+    return stats
+
+def _summarize(names, observed, stats):
+    std = stats.std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = (observed - stats.mean) / std
+    return {
+        name: {
+            "observed": float(observed[i]),
+            "mean": float(stats.mean[i]),
+            "std": float(std[i]),
+            "zscore": float(zscore[i]),
+            "n_samples": stats.count,
+        }
+        for i, name in enumerate(names)
+    }
+
+def null_model_ensemble(G, statistics=None, n_samples=500, n_iter=None, n_jobs=None, seed=None, chunksize=None, callback=None):
+    """
+    Compare statistics of a network against an ensemble of its
+    degree-preserving randomizations.
+
+    The randomizations run in a process pool using the array engine of
+    `degree_preserving_randomization` (see `EdgeSwapRandomizer`). The graph is
+    sent to each worker once, every sample gets an independent seed stream
+    spawned from `seed`, and the statistics are computed inside the workers.
+    Only running means and variances travel back, so memory does not grow
+    with `n_samples`.
+
+    Parameters
+    ----------
+    G : networkx.Graph or CSRGraph
+        The observed network. It must be simple. A CSRGraph is placed in 
+        shared memory instead of being pickled to the workers, and the 
+        statistics then receive randomized CSRGraphs.
+
+    statistics : dict or list of callables, optional
+        Functions mapping a graph to a number, e.g. `nx.transitivity`. A dict
+        maps names to functions; for a list the function names are used.
+        They must be picklable (module-level functions, not lambdas) when
+        `n_jobs != 1`, and accept a CSRGraph if G is one. Default: 
+        transitivity and degree assortativity, which accept both.
+
+    n_samples : int, optional (default=500)
+        Number of randomized graphs.
+
+    n_iter : int, optional
+        Edge swap iterations per randomized graph. Default: 10 times the
+        number of edges.
+
+    n_jobs : int, optional
+        Number of worker processes. Default: number of CPUs. With
+        `n_jobs=1` everything runs in the current process.
+
+    seed : int or None, optional
+        Seed of the ensemble. The same seed gives the same result regardless
+        of `n_jobs` and `chunksize`, up to floating point rounding.
+
+    chunksize : int, optional
+        Number of randomizations per task sent to a worker.
+
+    callback : callable, optional
+        Called as `callback(n_done, summary)` each time a task finishes, with
+        the running summary (same format as the return value).
+
+    Returns
+    -------
+    summary : dict
+        For each statistic name, a dict with the `observed` value, the
+        ensemble `mean` and `std`, the empirical `zscore`
+        ((observed - mean) / std) and `n_samples`.
+
+    Example
+    -------
+    >>> summary = null_model_ensemble(G, {"clustering": nx.transitivity}, n_samples=1000, seed=42)
+    >>> summary["clustering"]["zscore"]
+    """
+
+    if statistics is None:
+        statistics = {
+            "transitivity": _transitivity,
+            "assortativity": _degree_assortativity,
+        }
+    elif not isinstance(statistics, dict):
+        statistics = {statistic.__name__: statistic for statistic in statistics}
+    names = list(statistics)
+    functions = [statistics[name] for name in names]
+
+    if n_iter is None:
+        n_iter = 10 * G.number_of_edges()
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, min(32, n_samples // (4 * n_jobs)))
+
+    observed = np.array([statistic(G) for statistic in functions], dtype=float)
+    seeds = np.random.SeedSequence(seed).spawn(n_samples)
+    chunks = [seeds[i:i + chunksize] for i in range(0, n_samples, chunksize)]
+
+    stats = RunningStats(len(names))
+
+    def collect(chunk_stats):
+        stats.merge(chunk_stats)
+        if callback is not None:
+            callback(stats.count, _summarize(names, observed, stats))
+
+    if n_jobs == 1:
+        _init_worker(G)
+        try:
+            for chunk in chunks:
+                collect(_run_chunk(chunk, n_iter, functions))
+        finally:
+            _init_worker(None)
+    else:
+        with ExitStack() as stack:
+            shared = stack.enter_context(G.shared_memory()) if isinstance(G, CSRGraph) else G
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(shared,))
+            )
+            futures = [executor.submit(_run_chunk, chunk, n_iter, functions) for chunk in chunks]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    return _summarize(names, observed, stats)
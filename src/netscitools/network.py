@@ -1,25 +1,46 @@
-__all__ = ["describe_network", "degree_distribution", "degree_preserving_randomization", "dfs", "bfs"]
+__all__ = ["describe_network", "network_metrics", "degree_distribution", "degree_distribution_from_edgelist", "edgelist_degrees", "degree_preserving_randomization", "EdgeSwapRandomizer", "SwapStats", "dfs", "bfs", "iter_dfs", "iter_bfs", "path_length_distribution"]
+
+import io
+import math
+import os
+import re
+import time
+import warnings
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 import networkx as nx
 import numpy as np
 
-def describe_network(G):
+from .csr import CSRGraph
+
+def describe_network(G, metrics=("size", "transitivity"), formatter=None, **kwargs):
     """
-    Prints basic information on the networkx graph. Returns nothing.
+    Prints basic information on the networkx graph and returns it as a 
+    dict (see `network_metrics`).
 
     Parameters
     ----------
-        G (nx.Graph):
+        G (nx.Graph or CSRGraph):
             A network to describe
+        metrics (tuple of str):
+            Metrics to compute, see `network_metrics` (default: number of 
+            nodes and edges, and the clustering coefficient)
+        formatter (callable or False):
+            Function turning the metrics dict into the printed text 
+            (default: one "Name: value" line per metric); False to print 
+            nothing
+        **kwargs:
+            Passed to `network_metrics`, e.g. approximate=True
     """
 
-    N = G.number_of_nodes()
-    M = G.number_of_edges()
-    clustering_coef = nx.transitivity(G)
-
-    print("Number of nodes: {}".format(N))
-    print("Number of edges: {}".format(M))
-    print("Clustering coefficient: {}".format(clustering_coef))
+    result = network_metrics(G, metrics=metrics, **kwargs)
+    if formatter is None:
+        formatter = _format_metrics
+    if formatter:
+        print(formatter(result))
+    return result
 
 def degree_distribution(G, number_of_bins=15, log_binning=True, density=True):
     """
@@ -28,7 +49,7 @@ def degree_distribution(G, number_of_bins=15, log_binning=True, density=True):
     
     Parameters
     ----------
-    G (nx.Graph):
+    G (nx.Graph or CSRGraph):
         the network whose degree distribution to calculate
 
     number_of_bins (int):
@@ -49,7 +70,10 @@ def degree_distribution(G, number_of_bins=15, log_binning=True, density=True):
     """
     
     # Step 1: We will first need to define the support of our distribution
-    k = list(dict(G.degree()).values()) # get the degree of each node
+    k = _degrees(G)                     # get the degree of each node
+    return _degree_histogram(k, number_of_bins, log_binning, density)
+
+def _degree_histogram(k, number_of_bins, log_binning, density):
     kmax = np.max(k)                    # get the maximum degree
     
     
@@ -68,7 +92,477 @@ def degree_distribution(G, number_of_bins=15, log_binning=True, density=True):
     
     return bins[1:], hist
 
-def degree_preserving_randomization(G, n_iter=1000):
+def _add_counts(counts, ids):
+    # counts += bincount(ids), growing counts as larger node ids show up
+    new = np.bincount(ids)
+    if len(new) > len(counts):
+        counts = np.concatenate([counts, np.zeros(len(new) - len(counts), dtype=counts.dtype)])
+    counts[:len(new)] += new
+    return counts
+
+# Bytes read at a time from a text edge list, per edge of chunk_size
+_BYTES_PER_EDGE = 16
+
+def _comment_pattern(comments):
+    # Regex matching a comment up to the end of its line, or None
+    markers = [] if comments is None else [comments] if isinstance(comments, str) else list(comments)
+    markers = [marker.encode() for marker in markers if marker]
+    if not markers:
+        return None
+    return re.compile(b"(?:" + b"|".join(re.escape(marker) for marker in markers) + b")[^\n]*")
+
+def _parse_edge_block(block, dtype):
+    # (m, 2) array of the first two columns of whole lines of text, without 
+    # comments. If every line is blank or has exactly two tokens (checked 
+    # with array operations), the block is parsed by a single np.fromstring 
+    # call; anything else (e.g. weight columns) by np.loadtxt
+    b = np.frombuffer(block, dtype=np.uint8)
+    blank = b <= 32  # whitespace (and control characters)
+    token_starts = ~blank
+    token_starts[1:] &= blank[:-1]
+    is_newline = b == 10
+    # Token starts and newlines in order (True for a newline), without the 
+    # newlines of blank lines: (token, token, newline) repeated for two 
+    # columns
+    events = is_newline[np.flatnonzero(token_starts | is_newline)]
+    blank_line = events.copy()
+    blank_line[1:] &= events[:-1]
+    events = events[~blank_line]
+    if not len(events):
+        return np.empty((0, 2), dtype=dtype)
+    if len(events) % 3 == 0 and not events.reshape(-1, 3)[:, :2].any() and events[2::3].all():
+        with warnings.catch_warnings():
+            # At a token that is not an integer, NumPy raises or (before 
+            # 2.x) warns and stops early
+            warnings.simplefilter("error", DeprecationWarning)
+            try:
+                values = np.fromstring(block, dtype=np.int64, sep=" ")
+            except (ValueError, DeprecationWarning):
+                values = None
+        # Out-of-range integers are clipped to the int64 limits
+        limits = np.iinfo(np.int64)
+        if (values is not None and 3 * len(values) == 2 * len(events)
+                and values.min() > limits.min and values.max() < limits.max):
+            return values.reshape(-1, 2).astype(dtype, copy=False)
+    return np.loadtxt(io.BytesIO(block), dtype=dtype, comments=None, usecols=(0, 1), ndmin=2)
+
+def _read_edge_chunks(path, binary, dtype, delimiter, comments, chunk_size):
+    # Yield (m, 2) integer arrays of about chunk_size edges
+    if binary:
+        with open(path, "rb") as f:
+            while True:
+                chunk = np.fromfile(f, dtype=dtype, count=2 * chunk_size)
+                if len(chunk) == 0:
+                    return
+                if len(chunk) % 2:
+                    raise ValueError("{} does not contain whole (source, target) pairs".format(path))
+                yield chunk.reshape(-1, 2)
+    else:
+        # Fixed-size blocks of bytes, cut after their last newline
+        comment_pattern = _comment_pattern(comments)
+        block_size = max(1, chunk_size) * _BYTES_PER_EDGE
+        rest = b""
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(block_size)
+                block = rest + data
+                if data:
+                    cut = block.rfind(b"\n") + 1
+                    if cut == 0:
+                        rest = block  # no whole line yet
+                        continue
+                    block, rest = block[:cut], block[cut:]
+                else:
+                    block += b"\n"  # last line without a newline
+                if comment_pattern is not None:
+                    block = comment_pattern.sub(b"", block)
+                if delimiter is not None:
+                    block = block.replace(delimiter.encode(), b" ")
+                chunk = _parse_edge_block(block, dtype)
+                if len(chunk):
+                    yield chunk
+                if not data:
+                    return
+
+def edgelist_degrees(path, directed=False, degree="total", binary=False, dtype=np.int64, delimiter=None, comments="#", chunk_size=1 << 20):
+    """
+    Degrees of the nodes of an edge-list file, read in chunks without 
+    building a graph. Memory is O(largest node id).
+
+    Parameters
+    ----------
+    path (str):
+        edge-list file. Text files have one edge per line, "source target" 
+        followed by optional extra columns (e.g. weights). Binary files are 
+        a flat array of (source, target) pairs of `dtype`. Node ids must be 
+        non-negative integers.
+
+    directed (bool):
+        whether edges are directed (default: False)
+
+    degree (str):
+        "total", "in" or "out"; "in" and "out" require directed=True
+
+    binary (bool):
+        whether the file is binary (default: False, text)
+
+    dtype (np.dtype):
+        integer type of node ids, i.e. the layout of a binary file
+
+    delimiter (str or None), comments (str):
+        column separator (default: whitespace) and comment prefix of a 
+        text file
+
+    chunk_size (int):
+        number of edges read at a time (text files are read in blocks of 
+        about 16 bytes per edge)
+
+    Returns
+    -------
+    k (np.ndarray):
+        degree of every node that appears in the file, in order of node id. 
+        Repeated lines count as repeated edges; self-loops add 2 to the 
+        total degree, as in networkx.
+    """
+
+    if degree not in ("total", "in", "out"):
+        raise ValueError("degree must be 'total', 'in' or 'out', got {!r}".format(degree))
+    if degree != "total" and not directed:
+        raise ValueError("in- and out-degrees require directed=True")
+
+    out_degree = np.zeros(0, dtype=np.int64)
+    in_degree = np.zeros(0, dtype=np.int64)
+    for chunk in _read_edge_chunks(path, binary, dtype, delimiter, comments, chunk_size):
+        if chunk.min() < 0:
+            raise ValueError("node ids must be non-negative integers")
+        out_degree = _add_counts(out_degree, chunk[:, 0])
+        in_degree = _add_counts(in_degree, chunk[:, 1])
+
+    n = max(len(out_degree), len(in_degree))
+    out_degree = np.pad(out_degree, (0, n - len(out_degree)))
+    in_degree = np.pad(in_degree, (0, n - len(in_degree)))
+    total = out_degree + in_degree
+    # Node ids that never appear are not nodes
+    present = total > 0
+    k = {"total": total, "in": in_degree, "out": out_degree}[degree]
+    return k[present]
+
+def degree_distribution_from_edgelist(path, number_of_bins=15, log_binning=True, density=True, directed=False, degree="total", binary=False, dtype=np.int64, delimiter=None, comments="#", chunk_size=1 << 20):
+    """
+    Same as `degree_distribution`, but streams the degrees from an edge-list 
+    file (text or binary) instead of a graph. The file is read in chunks 
+    and degrees are accumulated with np.bincount, so memory is O(number of 
+    nodes) and the graph is never built. See `edgelist_degrees` for the file 
+    format and the `directed`, `degree`, `binary`, `dtype`, `delimiter`, 
+    `comments` and `chunk_size` parameters.
+
+    Returns
+    -------
+    bins, hist (np.ndarray):
+        as returned by `degree_distribution`
+    """
+
+    k = edgelist_degrees(path, directed=directed, degree=degree, binary=binary, dtype=dtype, delimiter=delimiter, comments=comments, chunk_size=chunk_size)
+    return _degree_histogram(k, number_of_bins, log_binning, density)
+
+def _degrees(G):
+    if isinstance(G, CSRGraph):
+        return G.degree()
+    return list(dict(G.degree()).values())
+
+def _csr_gather(indptr, indices, rows):
+    # Concatenated neighbor lists of `rows`, without a Python loop
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return indices[offsets]
+
+def _without_selfloops(G):
+    # (indptr, indices) of the adjacency of G without self-loops
+    if not isinstance(G, CSRGraph):
+        G = CSRGraph.from_networkx(G)
+    n = G.number_of_nodes()
+    rows = G._rows()
+    keep = rows != G.indices
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows[keep], minlength=n), out=indptr[1:])
+    return indptr, G.indices[keep]
+
+def _transitivity(G):
+    """
+    nx.transitivity, also for CSRGraph: 3 * triangles / connected triples, 
+    ignoring self-loops.
+    """
+
+    if not isinstance(G, CSRGraph):
+        return nx.transitivity(G)
+
+    n = G.number_of_nodes()
+    indptr, indices = _without_selfloops(G)
+    degree = np.diff(indptr)
+    triples = int(np.sum(degree * (degree - 1)))
+
+    if G.directed:
+        # Same definition as networkx on directed graphs: successors only
+        closed = 0
+        for v in np.flatnonzero(degree > 1).tolist():
+            neighbors = indices[indptr[v]:indptr[v + 1]]
+            closed += int(np.count_nonzero(np.isin(_csr_gather(indptr, indices, neighbors), neighbors)))
+        return 0 if closed == 0 else closed / triples
+
+    # Undirected: count each triangle once from its lowest-ranked node, 
+    # following edges towards higher (degree, id) rank
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), degree))] = np.arange(n)
+    rows = np.repeat(np.arange(n), degree)
+    forward = rank[rows] < rank[indices]
+    fwd_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows[forward], minlength=n), out=fwd_indptr[1:])
+    fwd_indices = indices[forward]
+    triangles = 0
+    for v in np.flatnonzero(np.diff(fwd_indptr) > 1).tolist():
+        neighbors = fwd_indices[fwd_indptr[v]:fwd_indptr[v + 1]]
+        triangles += int(np.count_nonzero(np.isin(_csr_gather(fwd_indptr, fwd_indices, neighbors), neighbors)))
+    return 0 if triangles == 0 else 6 * triangles / triples
+
+def _approximate_transitivity(G, n_samples=None, time_budget=None, confidence=0.95, seed=None, batch_size=10000):
+    """
+    Estimate the transitivity by wedge sampling: draw connected triples 
+    (v; a, b) uniformly, i.e. v with probability proportional to the number 
+    of its neighbor pairs and then two distinct neighbors a, b, and count 
+    the fraction that are closed (b is a neighbor of a). Sampling stops 
+    after `n_samples` wedges or `time_budget` seconds, whichever comes first 
+    (default: 100000 wedges). Returns (estimate, (low, high), n_samples) 
+    with a normal-approximation confidence interval.
+    """
+
+    if n_samples is None and time_budget is None:
+        n_samples = 100000
+    rng = np.random.default_rng(seed)
+    indptr, indices = _without_selfloops(G)
+    n = len(indptr) - 1
+    degree = np.diff(indptr)
+    wedges = (degree * (degree - 1)).astype(float)
+    if wedges.sum() == 0:
+        return 0.0, (0.0, 0.0), 0
+    cumulative = np.cumsum(wedges)
+    cumulative /= cumulative[-1]
+    # Sorted keys a * n + b of all (directed) adjacencies, for closure lookups
+    edge_keys = np.sort(np.repeat(np.arange(n, dtype=np.int64), degree) * n + indices)
+
+    start = time.perf_counter()
+    sampled = closed = 0
+    while True:
+        size = batch_size if n_samples is None else min(batch_size, n_samples - sampled)
+        if size <= 0:
+            break
+        centers = np.minimum(np.searchsorted(cumulative, rng.random(size), side="right"), n - 1)
+        d = degree[centers]
+        i = (rng.random(size) * d).astype(np.int64)
+        j = (rng.random(size) * (d - 1)).astype(np.int64)
+        j += j >= i
+        a = indices[indptr[centers] + i].astype(np.int64)
+        b = indices[indptr[centers] + j].astype(np.int64)
+        keys = a * n + b
+        position = np.minimum(np.searchsorted(edge_keys, keys), len(edge_keys) - 1)
+        closed += int(np.count_nonzero(edge_keys[position] == keys))
+        sampled += size
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            break
+
+    estimate = closed / sampled
+    z = _normal_quantile(0.5 + confidence / 2)
+    margin = z * np.sqrt(estimate * (1 - estimate) / sampled)
+    return estimate, (float(max(0.0, estimate - margin)), float(min(1.0, estimate + margin))), sampled
+
+def _normal_quantile(p):
+    # Inverse of the standard normal CDF, by bisection on math.erf
+    low, high = -10.0, 10.0
+    for _ in range(100):
+        mid = (low + high) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+def _connected_components(G):
+    """
+    Component label of every node (weakly connected for directed graphs), 
+    by vectorized hooking and pointer jumping over the edge list.
+    """
+
+    if not isinstance(G, CSRGraph):
+        G = CSRGraph.from_networkx(G)
+    edges = G.edges()
+    u, v = edges[:, 0], edges[:, 1]
+    parent = np.arange(G.number_of_nodes())
+    while True:
+        pu, pv = parent[u], parent[v]
+        differ = pu != pv
+        if not differ.any():
+            return parent
+        # Hook the larger root under the smaller one, then flatten the trees
+        np.minimum.at(parent, np.maximum(pu[differ], pv[differ]), np.minimum(pu[differ], pv[differ]))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+# Per-graph cache of computed metrics, dropped when the graph is garbage collected
+_metrics_cache = weakref.WeakKeyDictionary()
+# Metrics for which checking the cache (one pass over the edges) pays off
+_EXPENSIVE_METRICS = ("components", "transitivity")
+_HASH_MASK = (1 << 64) - 1
+
+METRICS = ("size", "density", "degree", "components", "transitivity")
+
+def network_metrics(G, metrics=None, approximate=False, n_samples=None, time_budget=None, confidence=0.95, seed=None, cache=False):
+    """
+    Compute a selection of network metrics and return them as a dict.
+
+    Parameters
+    ----------
+    G (nx.Graph or CSRGraph):
+        the network to describe
+
+    metrics (iterable of str or None):
+        which metrics to compute (default: all):
+        "size" -> number_of_nodes, number_of_edges;
+        "density" -> density;
+        "degree" -> degree_mean, degree_second_moment, degree_std, degree_max;
+        "components" -> number_of_components, largest_component_size 
+        (weakly connected for directed graphs);
+        "transitivity" -> transitivity (the clustering coefficient 
+        computed by nx.transitivity)
+
+    approximate (bool):
+        estimate the transitivity by wedge sampling instead of counting all 
+        triangles; adds transitivity_ci (confidence interval) and 
+        transitivity_samples (number of wedges sampled) to the result
+
+    n_samples (int or None), time_budget (float or None):
+        budget for wedge sampling, in wedges and in seconds; sampling stops 
+        at whichever is reached first (default: 100000 wedges)
+
+    confidence (float):
+        confidence level of transitivity_ci (default: 0.95)
+
+    seed (int or None):
+        seed for wedge sampling
+
+    cache (bool):
+        reuse metrics already computed for this graph object (default: 
+        False). A CSRGraph is read-only, so its metrics are reused as is. 
+        For a networkx graph, cached metrics are recomputed if the nodes or 
+        edges changed since, e.g. after rewiring it in place; checking this 
+        costs one pass over the edges, so the cache is only used when 
+        "components" or "transitivity" is requested.
+
+    Returns
+    -------
+    result (dict):
+        metric name -> value, for the requested metrics
+    """
+
+    metrics = METRICS if metrics is None else tuple(metrics)
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError("unknown metrics {}; choose from {}".format(sorted(unknown), METRICS))
+
+    computed = _cached_metrics(G, metrics) if cache else {}
+
+    result = {}
+    for metric in metrics:
+        key = metric
+        if metric == "transitivity" and approximate:
+            key = (metric, n_samples, time_budget, confidence, seed)
+        if key not in computed:
+            computed[key] = _compute_metric(G, metric, approximate, n_samples, time_budget, confidence, seed)
+        result.update(computed[key])
+    return result
+
+def _cached_metrics(G, metrics):
+    # Metrics cached for G, or a new dict if they cannot be reused. A 
+    # CSRGraph is read-only; a networkx graph is checked against its 
+    # fingerprint, which is only worth it for the metrics that cost at least 
+    # a pass over the edges
+    if isinstance(G, CSRGraph):
+        fingerprint = None
+    elif any(metric in _EXPENSIVE_METRICS for metric in metrics):
+        fingerprint = _fingerprint(G)
+    else:
+        return {}
+    entry = _metrics_cache.get(G)
+    if entry is None or entry[0] != fingerprint:
+        entry = _metrics_cache[G] = (fingerprint, {})
+    return entry[1]
+
+def _fingerprint(G):
+    # Changes whenever the nodes or edges of a networkx graph do, including 
+    # edge swaps that keep the number of edges. Sums the hashes of 
+    # (node, neighbors in adjacency order) as they are streamed, without 
+    # building the edge tuples; reordered neighbors only cause a cache miss
+    rows = zip(G._adj, map(tuple, G._adj.values()))
+    return (G.is_directed(), G.number_of_nodes(), sum(map(hash, rows)) & _HASH_MASK)
+
+def _compute_metric(G, metric, approximate, n_samples, time_budget, confidence, seed):
+    N = G.number_of_nodes()
+    M = G.number_of_edges()
+    if metric == "size":
+        return {"number_of_nodes": N, "number_of_edges": M}
+    if metric == "density":
+        pairs = N * (N - 1) if G.is_directed() else N * (N - 1) / 2
+        return {"density": M / pairs if pairs else 0.0}
+    if metric == "degree":
+        k = np.asarray(_degrees(G), dtype=float)
+        if len(k) == 0:
+            return {"degree_mean": 0.0, "degree_second_moment": 0.0, "degree_std": 0.0, "degree_max": 0}
+        return {
+            "degree_mean": float(k.mean()),
+            "degree_second_moment": float(np.mean(k ** 2)),
+            "degree_std": float(k.std()),
+            "degree_max": int(k.max()),
+        }
+    if metric == "components":
+        if N == 0:
+            return {"number_of_components": 0, "largest_component_size": 0}
+        sizes = np.bincount(_connected_components(G))
+        sizes = sizes[sizes > 0]
+        return {"number_of_components": len(sizes), "largest_component_size": int(sizes.max())}
+    if metric == "transitivity":
+        if not approximate:
+            return {"transitivity": _transitivity(G)}
+        estimate, interval, sampled = _approximate_transitivity(G, n_samples, time_budget, confidence, seed)
+        return {"transitivity": estimate, "transitivity_ci": interval, "transitivity_samples": sampled}
+
+_METRIC_NAMES = {
+    "number_of_nodes": "Number of nodes",
+    "number_of_edges": "Number of edges",
+    "density": "Density",
+    "degree_mean": "Mean degree",
+    "degree_second_moment": "Second moment of degree",
+    "degree_std": "Standard deviation of degree",
+    "degree_max": "Maximum degree",
+    "number_of_components": "Number of connected components",
+    "largest_component_size": "Size of the largest component",
+    "transitivity": "Clustering coefficient",
+}
+
+def _format_metrics(result):
+    lines = []
+    for key, name in _METRIC_NAMES.items():
+        if key not in result:
+            continue
+        line = "{}: {}".format(name, result[key])
+        if key == "transitivity" and "transitivity_ci" in result:
+            low, high = result["transitivity_ci"]
+            line += " (CI {:.4f}-{:.4f}, {} wedges sampled)".format(low, high, result["transitivity_samples"])
+        lines.append(line)
+    return "\n".join(lines)
+
+def degree_preserving_randomization(G, n_iter=1000, engine="networkx", seed=None, trace_interval=None, early_stop=False, callback=None, return_stats=False):
     """
     Perform degree-preserving randomization on a graph.
 
@@ -82,9 +576,11 @@ def degree_preserving_randomization(G, n_iter=1000):
 
     Parameters
     ----------
-    G : networkx.Graph
+    G : networkx.Graph or CSRGraph
         The input graph to be randomized. The graph can be directed or 
         undirected, but it must be simple (i.e., no self-loops or parallel edges).
+        A CSRGraph is always randomized with the "array" engine and a 
+        CSRGraph is returned.
 
     n_iter : int, optional (default=1000)
         The number of edge swap iterations to perform. A higher number of 
@@ -93,12 +589,53 @@ def degree_preserving_randomization(G, n_iter=1000):
         proportional to the number of edges in the graph for sufficient 
         randomization.
 
+    engine : {"networkx", "array"}, optional (default="networkx")
+        Swap engine to use. "networkx" edits a copy of `G` one swap at a 
+        time. "array" keeps the edges in NumPy endpoint arrays with a hashed 
+        edge index (see `EdgeSwapRandomizer`), so each iteration is O(1) and 
+        the graph is only rebuilt once at the end. Use "array" for large 
+        graphs or large `n_iter`; it drops edge attributes.
+
+    seed : int, numpy.random.Generator or None, optional (default=None)
+        Seed for the random number generator, for reproducible results.
+        With the "networkx" engine and no seed, the global `np.random` 
+        state is used.
+
+    trace_interval : int or None, optional (default=None)
+        If given, maintain the triangle count incrementally during the swaps 
+        and record the transitivity every `trace_interval` iterations. Only 
+        for undirected graphs; implies engine="array".
+
+    early_stop : bool, optional (default=False)
+        Stop before `n_iter` once the fraction of original edges still 
+        present has converged, checked once per number of edges iterations 
+        (see `EdgeSwapRandomizer.run`). `n_iter` is then an upper bound. 
+        Implies engine="array".
+
+    callback : callable or None, optional (default=None)
+        Called as `callback(stats)` with the `SwapStats` of the run once per 
+        number of edges iterations, e.g. for logging. Implies engine="array".
+
+    return_stats : bool, optional (default=False)
+        Also return the `SwapStats` (attempted/accepted swaps, rejections by 
+        reason, overlap with the original edges, time per phase). Implies 
+        engine="array".
+
     Returns
     -------
     G_random : networkx.Graph
         A randomized graph with the same degree distribution as the original 
         graph `G`, but with a shuffled edge structure.
 
+    trace : np.ndarray
+        Only returned if `trace_interval` is given. Array of shape (k, 2) 
+        with rows (iteration, transitivity), starting at iteration 0 and 
+        taken every `trace_interval` iterations; the last row is always the 
+        final iteration, so its value equals `nx.transitivity(G_random)`.
+
+    stats : SwapStats
+        Only returned if `return_stats` is True (after `trace`, if both).
+
     Notes
     -----
     - This method works by selecting two edges at random, say (u, v) and (x, y), 
@@ -110,13 +647,17 @@ def degree_preserving_randomization(G, n_iter=1000):
       of the network's structure or just its degree distribution.
     - The effectiveness of randomization depends on the number of iterations 
       (`n_iter`). As a rule of thumb, using about 10 times the number of edges 
-      in the graph for `n_iter` often provides sufficient randomization.
+      in the graph for `n_iter` often provides sufficient randomization. 
+      Rather than relying on the rule of thumb, `early_stop=True` stops once 
+      the overlap with the original edges has converged, and `return_stats` 
+      shows how far the graph has moved away from the original.
     
     Example
     -------
     >>> import networkx as nx
     >>> G = nx.erdos_renyi_graph(10, 0.5)
     >>> G_random = degree_preserving_randomization(G, n_iter=100)
+    >>> G_random = degree_preserving_randomization(G, n_iter=100, engine="array", seed=42)
     
     Citations
     ---------
@@ -127,21 +668,41 @@ def degree_preserving_randomization(G, n_iter=1000):
     *Science*, 296(5569), 910-913.
     """
 
+    if engine not in ("networkx", "array"):
+        raise ValueError("engine must be 'networkx' or 'array', got {!r}".format(engine))
+    is_csr = isinstance(G, CSRGraph)
+    instrumented = trace_interval is not None or early_stop or callback is not None or return_stats
+
+    if engine == "array" or is_csr or instrumented:
+        randomizer = EdgeSwapRandomizer(G, seed=seed, track_triangles=trace_interval is not None)
+        randomizer.run(n_iter, trace_interval=trace_interval, callback=callback, early_stop=early_stop)
+        G_random = randomizer.to_csr() if is_csr else randomizer.to_networkx()
+        if not (trace_interval is not None or return_stats):
+            return G_random
+        result = (G_random,)
+        if trace_interval is not None:
+            result += (np.array(randomizer.trace),)
+        if return_stats:
+            result += (randomizer.stats,)
+        return result
+
+    rng = np.random if seed is None else np.random.default_rng(seed)
+
     G_random = G.copy()
     edges = list(G_random.edges())
     num_edges = len(edges)
 
     for _ in range(n_iter):
         # Select two random edges (u, v) and (x, y)
-        edge1_id = np.random.choice(list(range(len(edges))))
+        edge1_id = rng.choice(list(range(len(edges))))
         u, v = edges[edge1_id]
-        edge2_id = np.random.choice(list(range(len(edges))))
+        edge2_id = rng.choice(list(range(len(edges))))
         x, y = edges[edge2_id]
 
         # Avoid selecting the same edge pair or creating self-loops
         if len({u, v, x, y}) == 4:
             # Swap the edges with some probability
-            if np.random.rand() > 0.5:
+            if rng.random() > 0.5:
                 # Swap (u, v) with (u, y) and (x, v)
                 if not (G_random.has_edge(u, y) or G_random.has_edge(x, v)):
                     G_random.remove_edge(u, v)
@@ -162,31 +723,786 @@ def degree_preserving_randomization(G, n_iter=1000):
 
     return G_random
 
-def dfs(explore_stack, nodes_visited, graph):
-    if len(explore_stack) == 0:
-        return nodes_visited
-    else:
-        current_node = explore_stack.pop(-1)
-        print('visiting node {}'.format(str(current_node)))
-        for neighbor in graph.neighbors(current_node):
-            if neighbor in nodes_visited:
+# Number of edge pairs drawn from the random generator at once
+_SWAP_BATCH_SIZE = 1 << 16
+
+class EdgeSwapRandomizer:
+    """
+    Array-backed engine for degree-preserving edge swaps.
+
+    The edges of the graph are kept in two NumPy endpoint arrays (`src`, 
+    `dst`) over integer node ids, together with a hashed index of the edges 
+    that are currently present. Picking a random edge pair is then a pair of 
+    array lookups and checking a candidate swap is a pair of set lookups, so 
+    each iteration costs O(1) regardless of the size of the graph. Swaps are 
+    done in place and a graph is only built by `to_networkx()` or `to_csr()`.
+
+    Parameters
+    ----------
+    G : networkx.Graph, networkx.DiGraph or CSRGraph
+        The graph to randomize. It must be simple (no parallel edges). For 
+        directed graphs, swaps preserve both in- and out-degrees.
+
+    seed : int, numpy.random.Generator or None, optional (default=None)
+        Seed for the random number generator.
+
+    track_triangles : bool, optional (default=False)
+        Maintain the number of triangles while swapping (undirected graphs 
+        only). Each accepted swap only updates the triangles through the two 
+        removed and the two added edges, by intersecting the neighbor sets of 
+        their endpoints. The number of connected triples is invariant under 
+        degree-preserving swaps, so `transitivity` is then available at any 
+        iteration without recounting, and `run()` can record a trace of it.
+
+    Example
+    -------
+    >>> randomizer = EdgeSwapRandomizer(G, seed=42)
+    >>> randomizer.run(10 * G.number_of_edges())
+    >>> G_random = randomizer.to_networkx()
+
+    >>> randomizer = EdgeSwapRandomizer(G, seed=42, track_triangles=True)
+    >>> randomizer.run(10 * G.number_of_edges(), trace_interval=G.number_of_edges())
+    >>> randomizer.trace  # [(iteration, transitivity), ...]
+
+    >>> randomizer = EdgeSwapRandomizer(G, seed=42)
+    >>> randomizer.run(100 * G.number_of_edges(), early_stop=True, callback=print)
+    >>> randomizer.stats.converged, randomizer.stats.overlap
+    """
+
+    def __init__(self, G, seed=None, track_triangles=False):
+        if G.is_multigraph():
+            raise nx.NetworkXNotImplemented("not implemented for multigraph type")
+        if track_triangles and G.is_directed():
+            raise nx.NetworkXNotImplemented("triangle tracking not implemented for directed type")
+
+        start_time = time.perf_counter()
+        self.G = G
+        self.directed = G.is_directed()
+        self.rng = np.random.default_rng(seed)
+        self.n_iter = 0
+
+        if isinstance(G, CSRGraph):
+            self.nodes = G.labels
+            edges = G.edges()
+        else:
+            self.nodes = list(G.nodes())
+            node_index = {node: i for i, node in enumerate(self.nodes)}
+            edges = np.fromiter(
+                (node_index[node] for edge in G.edges() for node in edge),
+                dtype=np.int64,
+                count=2 * G.number_of_edges(),
+            ).reshape(-1, 2)
+        if not self.directed:
+            # Store undirected edges as (smaller id, larger id)
+            edges.sort(axis=1)
+        self.src = edges[:, 0].copy()
+        self.dst = edges[:, 1].copy()
+
+        # Each edge (u, v) is indexed by the integer u * n + v
+        self._n = len(self.nodes)
+        self._edge_keys = set((self.src * self._n + self.dst).tolist())
+        self._original_keys = frozenset(self._edge_keys)
+
+        # Random edge pairs are drawn in blocks, so the swaps do not depend 
+        # on how the iterations are split between run() calls
+        self._pairs = []
+        self._flips = []
+        self._position = 0
+
+        self.trace = []
+        self._adj = None
+        if track_triangles:
+            self._init_triangles()
+
+        self.stats = SwapStats(len(self.src))
+        self.stats.time["setup"] = time.perf_counter() - start_time
+
+    def _init_triangles(self):
+        adj = [set() for _ in range(self._n)]
+        for u, v in zip(self.src.tolist(), self.dst.tolist()):
+            adj[u].add(v)
+            adj[v].add(u)
+        self._adj = adj
+        # Each triangle is seen once from each of its three edges
+        self._triangles = sum(
+            len(adj[u] & adj[v]) for u, v in zip(self.src.tolist(), self.dst.tolist())
+        ) // 3
+        degree = np.array([len(neighbors) for neighbors in adj], dtype=np.int64)
+        self._triples = int(np.sum(degree * (degree - 1) // 2))
+
+    @property
+    def triangles(self):
+        """Current number of triangles (requires track_triangles=True)."""
+        if self._adj is None:
+            raise ValueError("triangles are only tracked with track_triangles=True")
+        return self._triangles
+
+    @property
+    def transitivity(self):
+        """
+        Current transitivity, 3 * triangles / connected triples, equal to 
+        `nx.transitivity` of the current graph (requires track_triangles=True).
+        """
+        if self.triangles == 0:
+            return 0.0
+        return 3 * self._triangles / self._triples
+
+    def _key(self, u, v):
+        if not self.directed and u > v:
+            u, v = v, u
+        return u * self._n + v
+
+    def run(self, n_iter, trace_interval=None, callback=None, callback_interval=None, early_stop=False, tol=0.005, check_interval=None):
+        """
+        Attempt `n_iter` edge swaps in place. Returns the randomizer itself.
+
+        Each iteration draws two edges (u, v) and (x, y) uniformly at random 
+        and rewires them to (u, y) and (x, v). For undirected graphs, (x, y) 
+        is flipped with probability 1/2 so that both possible rewirings are 
+        tried. Swaps that would create a self-loop or a parallel edge are 
+        rejected. Counters and timings are kept in `self.stats`.
+
+        If `trace_interval` is given (requires track_triangles=True), 
+        `(iteration, transitivity)` is appended to `self.trace` every 
+        `trace_interval` iterations, counted since the randomizer was created, 
+        and once more when the run ends, unless it ended on such a multiple.
+        A trace that has levelled off indicates that the chain has mixed.
+
+        If `callback` is given, `callback(self.stats)` is called every 
+        `callback_interval` iterations (default: number of edges).
+
+        With `early_stop=True`, convergence is measured in accepted swaps, 
+        since rejected attempts do not change the graph (on dense graphs most 
+        attempts are rejected). The overlap with the original edges 
+        (`stats.overlap`) is compared over windows of at least 
+        `check_interval` accepted swaps (default: number of edges), looked at 
+        every `check_interval` iterations, and the run stops, with 
+        `stats.converged = True`, once it has dropped by less than `tol` per 
+        `check_interval` accepted swaps over a window. `n_iter` is then an 
+        upper bound.
+        """
+
+        start_time = time.perf_counter()
+        if trace_interval is not None:
+            if self._adj is None:
+                raise ValueError("trace_interval requires track_triangles=True")
+            if not self.trace:
+                self.trace.append((self.n_iter, self.transitivity))
+
+        sweep = max(1, len(self.src))
+        if callback is not None and callback_interval is None:
+            callback_interval = sweep
+        if early_stop and check_interval is None:
+            check_interval = sweep
+        intervals = [interval for interval in (
+            trace_interval,
+            callback_interval if callback is not None else None,
+            check_interval if early_stop else None,
+        ) if interval is not None]
+
+        # Swap up to the next iteration where something has to be recorded
+        end = self.n_iter + n_iter
+        # Start of the current early-stopping window: (accepted, overlap)
+        window = (self.stats.accepted, self.stats.overlap)
+        if early_stop:
+            self.stats.converged = False
+        while self.n_iter < end:
+            checkpoint = min([end] + [(self.n_iter // interval + 1) * interval for interval in intervals])
+            self._swap(checkpoint - self.n_iter)
+
+            if trace_interval is not None and self.n_iter % trace_interval == 0:
+                self.trace.append((self.n_iter, self.transitivity))
+            accepted = self.stats.accepted - window[0]
+            if early_stop and self.n_iter % check_interval == 0 and accepted >= check_interval:
+                overlap = self.stats.overlap
+                self.stats.converged = (window[1] - overlap) * check_interval / accepted < tol
+                window = (self.stats.accepted, overlap)
+            if callback is not None and self.n_iter % callback_interval == 0:
+                callback(self.stats)
+            if early_stop and self.stats.converged:
+                break
+
+        # Always end the trace with the state the graph is left in
+        if trace_interval is not None and self.trace[-1][0] != self.n_iter:
+            self.trace.append((self.n_iter, self.transitivity))
+
+        self.stats.time["swap"] += time.perf_counter() - start_time
+        return self
+
+    def _draw(self):
+        num_edges = len(self.src)
+        self._pairs = self.rng.integers(0, num_edges, size=(_SWAP_BATCH_SIZE, 2)).tolist()
+        if self.directed:
+            self._flips = [False] * _SWAP_BATCH_SIZE
+        else:
+            self._flips = (self.rng.random(_SWAP_BATCH_SIZE) < 0.5).tolist()
+        self._position = 0
+
+    def _swap(self, n_iter):
+        stats = self.stats
+        self.n_iter += n_iter
+        stats.attempted += n_iter
+        if len(self.src) < 2:
+            stats.rejected_same_edge += n_iter
+            return
+
+        src, dst = self.src, self.dst
+        edge_keys = self._edge_keys
+        original_keys = self._original_keys
+        key = self._key
+        adj = self._adj
+        accepted = same_edge = self_loop = multi_edge = 0
+        original_edges = stats.original_edges
+
+        remaining = n_iter
+        while remaining > 0:
+            if self._position >= len(self._pairs):
+                self._draw()
+            start = self._position
+            stop = min(start + remaining, len(self._pairs))
+            self._position = stop
+            remaining -= stop - start
+
+            for (i, j), flip in zip(self._pairs[start:stop], self._flips[start:stop]):
+                if i == j:
+                    same_edge += 1
+                    continue
+                u, v = src.item(i), dst.item(i)
+                x, y = src.item(j), dst.item(j)
+                if flip:
+                    x, y = y, x
+
+                # Rewire (u, v), (x, y) -> (u, y), (x, v)
+                if u == y or x == v:
+                    self_loop += 1
+                    continue
+                new_key1, new_key2 = key(u, y), key(x, v)
+                if new_key1 in edge_keys or new_key2 in edge_keys or new_key1 == new_key2:
+                    multi_edge += 1
+                    continue
+
+                old_key1, old_key2 = key(u, v), key(x, y)
+                edge_keys.remove(old_key1)
+                edge_keys.remove(old_key2)
+                edge_keys.add(new_key1)
+                edge_keys.add(new_key2)
+                original_edges += ((new_key1 in original_keys) + (new_key2 in original_keys)
+                                   - (old_key1 in original_keys) - (old_key2 in original_keys))
+                accepted += 1
+                if adj is not None:
+                    self._update_triangles(adj, u, v, x, y)
+                if not self.directed:
+                    u, y = min(u, y), max(u, y)
+                    x, v = min(x, v), max(x, v)
+                src[i], dst[i] = u, y
+                src[j], dst[j] = x, v
+
+        stats.accepted += accepted
+        stats.rejected_same_edge += same_edge
+        stats.rejected_self_loop += self_loop
+        stats.rejected_multi_edge += multi_edge
+        stats.original_edges = original_edges
+
+    def _update_triangles(self, adj, u, v, x, y):
+        # Replace (u, v), (x, y) by (u, y), (x, v) one edge at a time; the 
+        # triangles through an edge are the common neighbors of its endpoints
+        triangles = self._triangles
+        triangles -= len(adj[u] & adj[v])
+        adj[u].remove(v)
+        adj[v].remove(u)
+        triangles -= len(adj[x] & adj[y])
+        adj[x].remove(y)
+        adj[y].remove(x)
+        triangles += len(adj[u] & adj[y])
+        adj[u].add(y)
+        adj[y].add(u)
+        triangles += len(adj[x] & adj[v])
+        adj[x].add(v)
+        adj[v].add(x)
+        self._triangles = triangles
+
+    def to_networkx(self):
+        """
+        Build a networkx graph of the same type as the input graph, with the 
+        same nodes (and node attributes) and the current, swapped edges. 
+        Edge attributes are not carried over.
+        """
+
+        if isinstance(self.G, CSRGraph):
+            return self.to_csr().to_networkx()
+
+        start_time = time.perf_counter()
+        G_random = self.G.__class__()
+        G_random.graph.update(self.G.graph)
+        G_random.add_nodes_from(self.G.nodes(data=True))
+        nodes = self.nodes
+        G_random.add_edges_from(
+            (nodes[u], nodes[v]) for u, v in zip(self.src.tolist(), self.dst.tolist())
+        )
+        self.stats.time["build"] += time.perf_counter() - start_time
+        return G_random
+
+    def to_csr(self):
+        """Build a CSRGraph of the current, swapped edges (same node ids and labels)."""
+        start_time = time.perf_counter()
+        labels = self.G._labels if isinstance(self.G, CSRGraph) else self.nodes
+        G_random = CSRGraph.from_edges(
+            self._n, np.column_stack([self.src, self.dst]), directed=self.directed, labels=labels
+        )
+        self.stats.time["build"] += time.perf_counter() - start_time
+        return G_random
+
+class SwapStats:
+    """
+    Counters of an `EdgeSwapRandomizer`, updated by every `run()`.
+
+    Attributes
+    ----------
+    attempted, accepted : int
+        Number of swap iterations attempted and accepted.
+
+    rejected_same_edge, rejected_self_loop, rejected_multi_edge : int
+        Rejected attempts by reason: the same edge was drawn twice, the 
+        swap would create a self-loop, or it would create an edge that 
+        already exists.
+
+    num_edges, original_edges : int
+        Number of edges, and how many of the original edges are present.
+
+    converged : bool
+        Whether a run with early_stop=True stopped because the overlap with 
+        the original edges converged.
+
+    time : dict
+        Wall time in seconds spent in "setup" (building the arrays), "swap" 
+        (run) and "build" (to_networkx / to_csr).
+    """
+
+    def __init__(self, num_edges):
+        self.num_edges = num_edges
+        self.attempted = 0
+        self.accepted = 0
+        self.rejected_same_edge = 0
+        self.rejected_self_loop = 0
+        self.rejected_multi_edge = 0
+        self.original_edges = num_edges
+        self.converged = False
+        self.time = {"setup": 0.0, "swap": 0.0, "build": 0.0}
+
+    @property
+    def acceptance_rate(self):
+        return self.accepted / self.attempted if self.attempted else 0.0
+
+    @property
+    def overlap(self):
+        """Fraction of the original edges still present."""
+        return self.original_edges / self.num_edges if self.num_edges else 0.0
+
+    def as_dict(self):
+        result = {key: value for key, value in vars(self).items() if key != "time"}
+        result["acceptance_rate"] = self.acceptance_rate
+        result["overlap"] = self.overlap
+        result.update(("time_" + phase, seconds) for phase, seconds in self.time.items())
+        return result
+
+    def __repr__(self):
+        return "SwapStats(attempted={}, accepted={}, overlap={:.4f}, converged={})".format(
+            self.attempted, self.accepted, self.overlap, self.converged)
+
+def _neighbors(graph):
+    if isinstance(graph, CSRGraph):
+        return lambda node: graph.neighbors(node).tolist()
+    return graph.neighbors
+
+def _traverse(neighbors, frontier, nodes_visited, depth_first, max_depth=None):
+    # Nodes are marked as visited when they enter the frontier, with the 
+    # depth of their parent + 1, and yielded when they leave it
+    pop = frontier.pop if depth_first else frontier.popleft
+    push = frontier.append
+    while frontier:
+        current_node = pop()
+        depth = nodes_visited[current_node]
+        yield current_node, depth
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for neighbor in neighbors(current_node):
+            if neighbor not in nodes_visited:
+                nodes_visited[neighbor] = depth + 1
+                push(neighbor)
+
+def _traverse_csr(G, sources, depth_first, max_depth=None):
+    # Same traversal order as _traverse, with the visited depths in an array 
+    # instead of a dict; BFS expands a whole level at once
+    indptr, indices = G.indptr, G.indices
+    depth = np.full(G.number_of_nodes(), -1, dtype=np.int64)
+    sources = list(dict.fromkeys(sources))
+    depth[sources] = 0
+
+    if depth_first:
+        stack = sources[::-1]
+        while stack:
+            current_node = stack.pop()
+            current_depth = depth.item(current_node)
+            yield current_node, current_depth
+            if max_depth is not None and current_depth >= max_depth:
                 continue
-            else:
-                nodes_visited[neighbor] = nodes_visited[current_node] + 1
-                explore_stack.append(neighbor)
-        return dfs(explore_stack, nodes_visited, graph)
-    
-def bfs(explore_queue, nodes_visited, graph):
-    if len(explore_queue) == 0:
-        return nodes_visited
+            neighbors = indices[indptr[current_node]:indptr[current_node + 1]]
+            neighbors = neighbors[depth[neighbors] < 0]
+            depth[neighbors] = current_depth + 1
+            stack.extend(neighbors.tolist())
+        return
+
+    frontier = np.array(sources, dtype=np.int64)
+    current_depth = 0
+    while len(frontier):
+        for current_node in frontier.tolist():
+            yield current_node, current_depth
+        if max_depth is not None and current_depth >= max_depth:
+            return
+        neighbors = _csr_gather(indptr, indices, frontier)
+        neighbors = neighbors[depth[neighbors] < 0]
+        # Keep the first occurrence of each node, in discovery order
+        _, first = np.unique(neighbors, return_index=True)
+        frontier = neighbors[np.sort(first)].astype(np.int64)
+        current_depth += 1
+        depth[frontier] = current_depth
+
+def _sources(G, source):
+    # A single node or an iterable of nodes; a string is always one node
+    if source in G:
+        return [source]
+    if isinstance(source, (str, bytes)):
+        sources = [source]
     else:
-        current_node = explore_queue.pop(0)
-        print('visiting node ' + str(current_node))
-        for neighbor in graph.neighbors(current_node):
-            if neighbor in nodes_visited:
-                continue
-            else:
-                nodes_visited[neighbor] = nodes_visited[current_node] + 1
-                explore_queue.append(neighbor)
-        return bfs(explore_queue, nodes_visited, graph)
-    
+        try:
+            sources = list(source)
+        except TypeError:
+            sources = [source]
+    for node in sources:
+        if node not in G:
+            raise nx.NodeNotFound("Source {!r} is not in the graph".format(node))
+    return sources
+
+def iter_dfs(G, source, max_depth=None):
+    """
+    Iterative depth-first traversal, yielding `(node, depth)` lazily.
+
+    Uses an explicit stack, so it is not limited by Python's recursion 
+    limit, and prints nothing. Stop early by breaking out of the loop.
+
+    Parameters
+    ----------
+    G (nx.Graph or CSRGraph):
+        the network to traverse; for directed graphs, edges are followed 
+        from source to target. A CSRGraph is traversed over integer node 
+        ids, with the visited set kept in an array.
+
+    source (node or iterable of nodes):
+        start node(s); all start nodes have depth 0. A string is a single 
+        node. Raises nx.NodeNotFound for a start node not in G
+
+    max_depth (int or None):
+        do not expand nodes deeper than this (default: no limit)
+
+    Yields
+    ------
+    (node, depth) (tuple):
+        each reachable node once, with its depth in the search tree
+    """
+
+    sources = _sources(G, source)
+    if isinstance(G, CSRGraph):
+        return _traverse_csr(G, sources, True, max_depth)
+    nodes_visited = dict.fromkeys(sources, 0)
+    # Reverse so that the first source is visited first
+    return _traverse(G.neighbors, deque(reversed(list(nodes_visited))), nodes_visited, True, max_depth)
+
+def iter_bfs(G, source, max_depth=None):
+    """
+    Iterative breadth-first traversal, yielding `(node, depth)` lazily in 
+    order of increasing depth.
+
+    Uses a deque as the queue (O(1) per visit), so it is not limited by 
+    Python's recursion limit, and prints nothing. Stop early by breaking out 
+    of the loop.
+
+    Parameters
+    ----------
+    G (nx.Graph or CSRGraph):
+        the network to traverse; for directed graphs, edges are followed 
+        from source to target. A CSRGraph is traversed over integer node 
+        ids, with the visited set kept in an array.
+
+    source (node or iterable of nodes):
+        start node(s); all start nodes have depth 0. A string is a single 
+        node. Raises nx.NodeNotFound for a start node not in G
+
+    max_depth (int or None):
+        do not expand nodes deeper than this (default: no limit)
+
+    Yields
+    ------
+    (node, depth) (tuple):
+        each reachable node once, with its shortest-path distance from the 
+        nearest start node
+    """
+
+    sources = _sources(G, source)
+    if isinstance(G, CSRGraph):
+        return _traverse_csr(G, sources, False, max_depth)
+    nodes_visited = dict.fromkeys(sources, 0)
+    return _traverse(G.neighbors, deque(nodes_visited), nodes_visited, False, max_depth)
+
+def dfs(explore_stack, nodes_visited, graph, verbose=True):
+    """
+    Depth-first search from the nodes in `explore_stack`. Fills in and 
+    returns `nodes_visited` (node -> depth). Thin wrapper around the 
+    iterative traversal of `iter_dfs`; `explore_stack` is emptied.
+
+    Set verbose=False to skip printing every visited node.
+    """
+
+    frontier = deque(explore_stack)
+    explore_stack.clear()
+    for current_node, _ in _traverse(_neighbors(graph), frontier, nodes_visited, True):
+        if verbose:
+            print('visiting node {}'.format(str(current_node)))
+    return nodes_visited
+
+def bfs(explore_queue, nodes_visited, graph, verbose=True):
+    """
+    Breadth-first search from the nodes in `explore_queue`. Fills in and 
+    returns `nodes_visited` (node -> depth). Thin wrapper around the 
+    iterative traversal of `iter_bfs`; `explore_queue` is emptied.
+
+    Set verbose=False to skip printing every visited node.
+    """
+
+    frontier = deque(explore_queue)
+    explore_queue.clear()
+    for current_node, _ in _traverse(_neighbors(graph), frontier, nodes_visited, False):
+        if verbose:
+            print('visiting node ' + str(current_node))
+    return nodes_visited
+
+def _in_adjacency(G):
+    # CSR whose row v lists the nodes with an edge *into* v (all neighbors 
+    # if undirected)
+    if not isinstance(G, CSRGraph):
+        G = CSRGraph.from_networkx(G)
+    return G.reverse()
+
+def _bit_counts(bitsets, num_bits, chunk_size=1 << 16):
+    # Number of rows with each bit set, for a (rows, words) uint64 array
+    counts = np.zeros(bitsets.shape[1] * 64, dtype=np.int64)
+    rows = np.flatnonzero(bitsets.any(axis=1))
+    for start in range(0, len(rows), chunk_size):
+        chunk = bitsets[rows[start:start + chunk_size]]
+        bits = np.unpackbits(chunk.view(np.uint8), axis=1, bitorder="little")
+        counts += bits.sum(axis=0, dtype=np.int64)
+    return counts[:num_bits]
+
+# Adjacency attached once by each worker process in the pool initializer
+_worker_adjacency = None
+
+def _init_bfs_worker(adjacency):
+    global _worker_adjacency
+    if hasattr(adjacency, "attach"):
+        adjacency = adjacency.attach()
+    _worker_adjacency = adjacency
+
+def _multi_source_bfs(sources):
+    """
+    BFS from all `sources` at once. Each node holds one bit per source in 
+    its visited and frontier bitsets; a level is one vectorized sweep that 
+    ORs the frontier bitsets of every node's in-neighbors. Returns the 
+    (sources, depth) matrix of node counts at each distance 1, 2, ...
+    """
+
+    indptr, indices = _worker_adjacency.indptr, _worker_adjacency.indices
+    n = len(indptr) - 1
+    num_sources = len(sources)
+    num_words = (num_sources + 63) // 64
+
+    source_ids = np.arange(num_sources)
+    frontier = np.zeros((n, num_words), dtype=np.uint64)
+    np.bitwise_or.at(
+        frontier,
+        (np.asarray(sources), source_ids // 64),
+        np.left_shift(np.uint64(1), (source_ids % 64).astype(np.uint64)),
+    )
+    visited = frontier.copy()
+
+    # reduceat needs the segment starts of non-empty rows only
+    nonempty = np.flatnonzero(indptr[1:] > indptr[:-1])
+    starts = indptr[nonempty]
+
+    counts = []
+    while True:
+        reached = np.zeros_like(frontier)
+        if len(starts):
+            reached[nonempty] = np.bitwise_or.reduceat(frontier[indices], starts, axis=0)
+        frontier = reached & ~visited
+        if not frontier.any():
+            break
+        visited |= frontier
+        counts.append(_bit_counts(frontier, num_sources))
+
+    if not counts:
+        return np.zeros((num_sources, 0), dtype=np.int64)
+    return np.stack(counts, axis=1)
+
+def _batch_sums(sources):
+    # Additive per-batch sums used to build estimates and standard errors
+    counts = _multi_source_bfs(sources)
+    distances = np.arange(1, counts.shape[1] + 1)
+    a = counts @ distances  # sum of distances from each source
+    b = counts.sum(axis=1)  # number of nodes reached from each source
+    return {
+        "hist": counts.sum(axis=0),
+        "hist_sq": (counts ** 2).sum(axis=0),
+        "a": a.sum(), "b": b.sum(),
+        "aa": (a * a).sum(), "bb": (b * b).sum(), "ab": (a * b).sum(),
+    }
+
+def _add_padded(x, y):
+    if len(x) < len(y):
+        x, y = y, x
+    x = x.copy()
+    x[:len(y)] += y
+    return x
+
+def path_length_distribution(G, n_sources=None, density=True, batch_size=64, n_jobs=None, seed=None, return_error=False):
+    """
+    Distribution of shortest path lengths, computed with batched 
+    multi-source BFS.
+
+    Sources are processed `batch_size` at a time: every node keeps one bit 
+    per source of the batch, and each BFS level is a single vectorized sweep 
+    over a compact (CSR) adjacency. Batches run in parallel in a process 
+    pool; the adjacency is placed in shared memory once and attached by the 
+    workers. With `n_sources`, only a uniform sample of source nodes is 
+    used, which gives an unbiased estimate with standard errors.
+
+    Parameters
+    ----------
+    G (nx.Graph or CSRGraph):
+        the network; for directed graphs, paths follow edge directions
+
+    n_sources (int or None):
+        number of source nodes sampled uniformly without replacement
+        (default: None, all nodes, i.e. exact)
+
+    density (bool):
+        whether to return pair counts or the probability of each path 
+        length (default: True)
+
+    batch_size (int):
+        number of sources per sweep; memory grows with batch_size * edges
+
+    n_jobs (int or None):
+        number of worker processes (default: number of CPUs; 1 runs in the 
+        current process)
+
+    seed (int or None):
+        seed for sampling the sources
+
+    return_error (bool):
+        also return a dict with error estimates (see below)
+
+    Returns
+    -------
+    bins, hist (np.ndarray):
+        path lengths 1, 2, ..., longest path length found; the probability 
+        of each length if density=True, the number of (ordered) pairs of 
+        nodes at that distance otherwise, scaled up to all sources when 
+        sampling. Unreachable pairs are not counted.
+
+    error (dict):
+        only if return_error=True. `hist_stderr`: standard error of each 
+        value of hist; `mean`, `mean_stderr`, `mean_ci95`: average 
+        shortest path length with its standard error and 95% confidence 
+        interval; `diameter`: longest path length found (a lower bound when 
+        sampling); `n_sources`; `exact`. Standard errors are 0 when exact.
+    """
+
+    n = G.number_of_nodes()
+    if n_sources is None or n_sources >= n:
+        sources = np.arange(n)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(n, size=n_sources, replace=False))
+    num_sources = len(sources)
+    batches = [sources[i:i + batch_size] for i in range(0, num_sources, batch_size)]
+
+    adjacency = _in_adjacency(G)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    totals = None
+    def collect(sums):
+        nonlocal totals
+        if totals is None:
+            totals = sums
+        else:
+            totals = {key: _add_padded(totals[key], value) if key.startswith("hist") else totals[key] + value
+                      for key, value in sums.items()}
+
+    if n_jobs == 1 or len(batches) <= 1:
+        _init_bfs_worker(adjacency)
+        try:
+            for batch in batches:
+                collect(_batch_sums(batch))
+        finally:
+            _init_bfs_worker(None)
+    else:
+        with adjacency.shared_memory() as handle:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_bfs_worker, initargs=(handle,)) as executor:
+                for sums in executor.map(_batch_sums, batches):
+                    collect(sums)
+
+    if totals is None:
+        hist_sum = hist_sq = np.zeros(0)
+        totals = dict(a=0, b=0, aa=0, bb=0, ab=0)
+    else:
+        hist_sum = totals["hist"].astype(float)
+        hist_sq = totals["hist_sq"].astype(float)
+    bins = np.arange(1, len(hist_sum) + 1)
+
+    # Scale the sampled sources up to all n sources, with finite population correction
+    k = num_sources
+    exact = k == n
+    scale = n / k if k else 0.0
+    fpc = 1 - k / n if n else 0.0
+    hist = scale * hist_sum
+    if k > 1 and not exact:
+        var = (hist_sq - hist_sum ** 2 / k) / (k - 1)
+        hist_stderr = n * np.sqrt(np.maximum(var, 0) / k * fpc)
+    else:
+        hist_stderr = np.zeros_like(hist)
+
+    if density and hist.sum() > 0:
+        total = hist.sum()
+        hist = hist / total
+        hist_stderr = hist_stderr / total
+
+    if not return_error:
+        return bins, hist
+
+    # Average path length as a ratio estimator over sources (delta method)
+    a, b = totals["a"], totals["b"]
+    mean = a / b if b else float("nan")
+    if b and k > 1 and not exact:
+        ss = totals["aa"] - 2 * mean * totals["ab"] + mean ** 2 * totals["bb"]
+        mean_stderr = float(np.sqrt(max(ss, 0) / (k - 1) / k * fpc) / (b / k))
+    else:
+        mean_stderr = 0.0
+    error = {
+        "hist_stderr": hist_stderr,
+        "mean": float(mean),
+        "mean_stderr": mean_stderr,
+        "mean_ci95": (float(mean) - 1.96 * mean_stderr, float(mean) + 1.96 * mean_stderr),
+        "diameter": int(len(bins)),
+        "n_sources": int(k),
+        "exact": exact,
+    }
+    return bins, hist, error
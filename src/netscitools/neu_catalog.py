@@ -0,0 +1,313 @@
+__all__ = ["fetch_northeastern_catalog", "get_northeastern_departments", "CatalogCache"]
+
+import hashlib
+import http.client
+import json
+import multiprocessing
+import os
+import re
+import threading
+import urllib.error
+import urllib.parse
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from .neu_courses import PARSER_VERSION, _default_parser, get_northeastern_course_info
+
+CATALOG_URL = "https://catalog.northeastern.edu/course-descriptions/"
+
+def get_northeastern_departments(index_html):
+    """
+    Given the raw HTML of the course descriptions index page
+    (https://catalog.northeastern.edu/course-descriptions/), return the list
+    of department codes, e.g. ["ACCT", "AFAM", ...], in page order.
+    """
+
+    from bs4 import BeautifulSoup  # optional dependency ("scraping" extra)
+
+    soup = BeautifulSoup(index_html, "html.parser")
+    departments = []
+    for link in soup.find_all("a", href=True):
+        match = re.fullmatch(r".*/course-descriptions/([A-Za-z0-9]+)/?", link["href"])
+        if match and match.group(1).upper() not in departments:
+            departments.append(match.group(1).upper())
+    return departments
+
+class CatalogCache:
+    """
+    On-disk cache of catalog pages and their parsed course information.
+
+    Pages are stored by the SHA-256 of their content (`objects/`), so an
+    unchanged page maps to the same object whatever its URL or download
+    date, and parse results are stored under the same hash, the parser 
+    version and the HTML parser used (`parsed/<sha256>.v<version>-lxml.json`),
+    so a new parser output format is never mixed with old cached results.
+    `index.json` maps each URL to the hash of its last downloaded content,
+    with the ETag and Last-Modified headers used to revalidate it.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory of the cache; created if needed.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "parsed"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(cache_dir, "index.json")
+        try:
+            with open(self._index_path) as f:
+                self._index = json.load(f)
+        except FileNotFoundError:
+            self._index = {}
+
+    def _write(self, path, data):
+        # Write to a temporary file and rename, so readers never see partial files
+        tmp_path = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def entry(self, url):
+        """Cached {"sha256", "etag", "last_modified"} of a URL, or None."""
+        with self._lock:
+            entry = self._index.get(url)
+        if entry is not None and not os.path.exists(self.page_path(entry["sha256"])):
+            return None
+        return entry
+
+    def page_path(self, sha256):
+        return os.path.join(self.cache_dir, "objects", sha256[:2], sha256 + ".html")
+
+    def put_page(self, url, content, etag=None, last_modified=None):
+        """Store the content (bytes) of a URL and return its hash."""
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self.page_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write(path, content)
+        with self._lock:
+            self._index[url] = {"sha256": sha256, "etag": etag, "last_modified": last_modified}
+        return sha256
+
+    def read_page(self, sha256):
+        with open(self.page_path(sha256), encoding="utf-8") as f:
+            return f.read()
+
+    def get_parsed(self, sha256):
+        """Parsed course information of a page, or None if not parsed yet."""
+        try:
+            with open(self._parsed_path(sha256)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put_parsed(self, sha256, courses_info):
+        self._write(self._parsed_path(sha256), json.dumps(courses_info).encode())
+
+    def _parsed_path(self, sha256):
+        return os.path.join(self.cache_dir, "parsed", "{}.v{}-{}.json".format(sha256, PARSER_VERSION, _default_parser()))
+
+    def save_index(self):
+        with self._lock:
+            data = json.dumps(self._index, indent=1, sort_keys=True).encode()
+        self._write(self._index_path, data)
+
+class _Connections:
+    # One keep-alive connection per host and per fetching thread, all 
+    # closed by close() once the downloads are done
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = set()
+
+    def get(self, scheme, netloc):
+        connections = self._local.__dict__.setdefault("connections", {})
+        if (scheme, netloc) not in connections:
+            connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connections[scheme, netloc] = connection_class(netloc, timeout=self.timeout)
+            with self._lock:
+                self._open.add(connections[scheme, netloc])
+        return connections[scheme, netloc]
+
+    def drop(self, scheme, netloc):
+        connection = self._local.__dict__.get("connections", {}).pop((scheme, netloc), None)
+        if connection is not None:
+            connection.close()
+            with self._lock:
+                self._open.discard(connection)
+
+    def close(self):
+        with self._lock:
+            connections, self._open = self._open, set()
+        for connection in connections:
+            connection.close()
+
+def _http_get(url, headers, connections, max_redirects=5):
+    for _ in range(max_redirects + 1):
+        parts = urllib.parse.urlsplit(url)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        # A kept-alive connection may have been closed by the server: retry once
+        for attempt in range(2):
+            connection = connections.get(parts.scheme, parts.netloc)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                connections.drop(parts.scheme, parts.netloc)
+                if attempt:
+                    raise
+        if response.will_close:
+            connections.drop(parts.scheme, parts.netloc)
+
+        location = response.getheader("Location")
+        if response.status in (301, 302, 303, 307, 308) and location:
+            url = urllib.parse.urljoin(url, location)
+            continue
+        return url, response, body
+    raise urllib.error.HTTPError(url, response.status, "too many redirects", response.headers, None)
+
+def _fetch(url, cache, connections):
+    """
+    Download a URL into the cache, revalidating a cached copy with
+    If-None-Match / If-Modified-Since. Returns (sha256, downloaded).
+    """
+
+    headers = {"User-Agent": "netscitools", "Accept-Encoding": "identity"}
+    entry = cache.entry(url)
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    final_url, response, body = _http_get(url, headers, connections)
+    if response.status == 304 and entry is not None:
+        return entry["sha256"], False
+    if response.status != 200:
+        raise urllib.error.HTTPError(final_url, response.status, response.reason, response.headers, None)
+
+    # Store pages as UTF-8 text, whatever the charset they were served in
+    charset = response.headers.get_content_charset() or "utf-8"
+    content = body.decode(charset, errors="replace").encode("utf-8")
+    sha256 = cache.put_page(url, content, etag=response.getheader("ETag"), last_modified=response.getheader("Last-Modified"))
+    return sha256, True
+
+def _parse_page(path):
+    with open(path, encoding="utf-8") as f:
+        return get_northeastern_course_info(f.read(), fast=True)
+
+def _parse_context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None  # platform default (spawn on Windows)
+
+def _default_cache_dir():
+    return os.path.join(os.path.expanduser("~"), ".cache", "netscitools", "catalog")
+
+def fetch_northeastern_catalog(departments=None, cache_dir=None, base_url=CATALOG_URL, max_workers=16, parse_workers=None, timeout=30, return_stats=False):
+    """
+    Download and parse the course descriptions of many departments.
+
+    Pages are downloaded concurrently by a bounded thread pool, with one
+    kept-alive connection per thread. They are stored in a content-addressed
+    `CatalogCache` and revalidated with ETag / Last-Modified on later runs.
+    Pages are parsed with `get_northeastern_course_info` in a process pool
+    as they arrive, and parse results are cached by content hash: when no
+    page has changed, nothing is parsed and no process pool is started.
+
+    Parameters
+    ----------
+        departments: list of str or None
+            Department codes, e.g. ["CHME", "SPNS"]. Default: every
+            department listed on the index page at `base_url`.
+        cache_dir: str or None
+            Cache directory (default: ~/.cache/netscitools/catalog).
+        base_url: str
+            URL of the course descriptions index; department pages are at
+            `base_url + code.lower() + "/"`. Point it to a local server for
+            testing.
+        max_workers: int
+            Number of concurrent downloads.
+        parse_workers: int or None
+            Number of parsing processes (default: number of CPUs).
+        timeout: float
+            Timeout of each request, in seconds.
+        return_stats: bool
+            Also return a dict with the number of pages `downloaded`,
+            `not_modified` (HTTP 304), `parsed` and `parse_cached`, and the
+            download or parse `errors` per department.
+
+    Returns
+    -------
+        catalog: dict
+            Department code -> courses info, as returned by
+            `get_northeastern_course_info`. Departments that failed to
+            download or parse are left out with a warning.
+        stats: dict
+            Only if return_stats=True.
+    """
+
+    cache = CatalogCache(cache_dir or _default_cache_dir())
+    stats = {"downloaded": 0, "not_modified": 0, "parsed": 0, "parse_cached": 0, "errors": {}}
+    connections = _Connections(timeout)
+
+    catalog = {}
+    parse_pool = None
+    parse_futures = {}
+    try:
+        if departments is None:
+            sha256, _ = _fetch(base_url, cache, connections)
+            departments = get_northeastern_departments(cache.read_page(sha256))
+        urls = {department: urllib.parse.urljoin(base_url, department.lower() + "/") for department in departments}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as fetch_pool:
+            fetch_futures = {fetch_pool.submit(_fetch, url, cache, connections): department for department, url in urls.items()}
+            for future in as_completed(fetch_futures):
+                department = fetch_futures[future]
+                try:
+                    sha256, downloaded = future.result()
+                except Exception as error:
+                    warnings.warn("could not fetch {} ({}): {}".format(department, urls[department], error))
+                    stats["errors"][department] = str(error)
+                    continue
+                stats["downloaded" if downloaded else "not_modified"] += 1
+
+                courses_info = cache.get_parsed(sha256)
+                if courses_info is not None:
+                    stats["parse_cached"] += 1
+                    catalog[department] = courses_info
+                    continue
+                if parse_pool is None:
+                    # The fetching threads are running: do not fork this 
+                    # process, start the workers from a fork server
+                    parse_pool = ProcessPoolExecutor(max_workers=parse_workers, mp_context=_parse_context())
+                parse_futures[parse_pool.submit(_parse_page, cache.page_path(sha256))] = (department, sha256)
+
+        for future in as_completed(parse_futures):
+            department, sha256 = parse_futures[future]
+            try:
+                courses_info = future.result()
+            except Exception as error:
+                warnings.warn("could not parse {} ({}): {}".format(department, urls[department], error))
+                stats["errors"][department] = str(error)
+                continue
+            cache.put_parsed(sha256, courses_info)
+            stats["parsed"] += 1
+            catalog[department] = courses_info
+    finally:
+        connections.close()
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        cache.save_index()
+
+    catalog = {department: catalog[department] for department in departments if department in catalog}
+    if return_stats:
+        return catalog, stats
+    return catalog
@@ -1,10 +1,14 @@
-__all__ = ["get_northeastern_course_info", "create_course_prerequisite_network"]
+__all__ = ["get_northeastern_course_info", "iter_northeastern_course_info", "create_course_prerequisite_network", "PrerequisiteGraph"]
 
 
-import pandas as pd
-from bs4 import BeautifulSoup
+import copy
+import hashlib
+import re
+from collections import OrderedDict, deque
 
-def get_northeastern_course_info(dept_html):
+import networkx as nx
+
+def get_northeastern_course_info(dept_html, fast=False, cache=False):
     """
     Given a string of raw html (dept_html) that contains a department's course titles and descriptions, this returns a useful data structure that contains the titles, descriptions, and prerequisites.
 
@@ -17,6 +21,18 @@ def get_northeastern_course_info(dept_html):
             dept_html = requests.get("https://catalog.northeastern.edu/course-descriptions/CHME/").text
             get_northeastern_course_info(dept_html)
             ```
+        fast: bool
+            Only parse the course descriptions (`sc_sccoursedescs`) subtree of 
+            the page instead of building the whole page with BeautifulSoup. 
+            Same output, except that a page without `div#col-content` is 
+            parsed instead of raising AttributeError. It is several times 
+            faster only if lxml is installed; without it, a SoupStrainer is 
+            used and parsing takes about as long as the default. See 
+            `iter_northeastern_course_info`.
+        cache: bool
+            Memoize the result by a hash of `dept_html` and the parser used, 
+            so parsing the same page again is free. Each call returns a 
+            fresh copy.
 
     Returns
     -------
@@ -31,10 +47,26 @@ def get_northeastern_course_info(dept_html):
         ]
     """
 
-    def replace_string(s):
-        s = s.replace(u'\xa0', ' ')
-        return s
-        
+    if cache:
+        key = hashlib.sha1(dept_html.encode("utf-8", "surrogatepass")).hexdigest()
+        if fast:
+            key += "-fast-" + _default_parser()
+        if key not in _parse_cache:
+            _parse_cache[key] = get_northeastern_course_info(dept_html, fast=fast)
+            if len(_parse_cache) > _PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+        _parse_cache.move_to_end(key)
+        return copy.deepcopy(_parse_cache[key])
+
+    if fast:
+        courses_info = list(iter_northeastern_course_info(dept_html))
+        # Same return value as below for pages without course descriptions
+        if not courses_info and not _has_coursedescs(dept_html):
+            return {}
+        return courses_info
+
+    from bs4 import BeautifulSoup  # optional dependency ("scraping" extra)
+
     soup = BeautifulSoup(dept_html, "html.parser")
     colcontent_div = soup.find('div', id="col-content")
     coursedescs_div = colcontent_div.find('div', class_="sc_sccoursedescs")
@@ -47,36 +79,179 @@ def get_northeastern_course_info(dept_html):
         
     courses_info = []
     for blk in courseblock_div:
-        prereqs = []
-        course_titles = replace_string(blk.find('p', class_="courseblocktitle").text)
-
-        course_id = course_titles.split(".")[0]
-        course_desc = replace_string(blk.find('p', class_="cb_desc").text)
-
-        course_prereq_p_list = blk.find_all('p', class_="courseblockextra")
-
-        # Remove corequisite
-        course_prereq_p_list2 = []
-        for course_prereq_p in course_prereq_p_list:
-            if "Prerequisite" in course_prereq_p.find('strong').text:
-                course_prereq_p_list2.append(course_prereq_p)
-
-        for course_prereq_p in course_prereq_p_list2:
-            if course_prereq_p:
-                course_prereq_links = course_prereq_p.find_all('a')
-                for course_prereq_link in course_prereq_links:
-                    prereqs.append(replace_string(course_prereq_link.text))
-            
-        courses_info.append({'id': course_id, 'title': course_titles, 'description': course_desc, 'prerequisite': prereqs})
+        courses_info.append(_course_record(blk))
     
     return courses_info
     # pass
 
+# Version of the course records returned by get_northeastern_course_info;
+# bump it when their content changes so that on-disk caches of parse 
+# results (neu_catalog.CatalogCache) are invalidated
+PARSER_VERSION = 2
+
+# Parsed pages memoized by get_northeastern_course_info(..., cache=True)
+_PARSE_CACHE_SIZE = 256
+_parse_cache = OrderedDict()
+
+def _replace_string(s):
+    s = s.replace(u'\xa0', ' ')
+    return s
+
+def _course_record(blk):
+    # Course information of one div.courseblock
+    prereqs = []
+    course_titles = _replace_string(blk.find('p', class_="courseblocktitle").text)
+
+    course_id = course_titles.split(".")[0]
+    course_desc = _replace_string(blk.find('p', class_="cb_desc").text)
+
+    course_prereq_p_list = blk.find_all('p', class_="courseblockextra")
+
+    # Remove corequisite
+    course_prereq_p_list2 = []
+    for course_prereq_p in course_prereq_p_list:
+        if "Prerequisite" in course_prereq_p.find('strong').text:
+            course_prereq_p_list2.append(course_prereq_p)
+
+    for course_prereq_p in course_prereq_p_list2:
+        if course_prereq_p:
+            course_prereq_links = course_prereq_p.find_all('a')
+            for course_prereq_link in course_prereq_links:
+                prereqs.append(_replace_string(course_prereq_link.text))
+
+    return {'id': course_id, 'title': course_titles, 'description': course_desc, 'prerequisite': prereqs}
+
+def _has_lxml():
+    try:
+        import lxml.html  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _default_parser():
+    # Parser used by iter_northeastern_course_info(dept_html)
+    return "lxml" if _has_lxml() else "html.parser"
+
+def _has_coursedescs(dept_html):
+    return 'sc_sccoursedescs' in dept_html
+
+def _find_coursedescs(dept_html):
+    # Build only the div.sc_sccoursedescs subtree of the page
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    strainer = SoupStrainer('div', class_="sc_sccoursedescs")
+    soup = BeautifulSoup(dept_html, "html.parser", parse_only=strainer)
+    return soup.find('div', class_="sc_sccoursedescs")
+
+def _xpath_class(name):
+    return "contains(concat(' ', normalize-space(@class), ' '), ' {} ')".format(name)
+
+_XPATH_COURSEDESCS = "//div[{}]".format(_xpath_class("sc_sccoursedescs"))
+_XPATH_COURSEBLOCK = ".//div[{}]".format(_xpath_class("courseblock"))
+_XPATH_TITLE = ".//p[{}]".format(_xpath_class("courseblocktitle"))
+_XPATH_DESC = ".//p[{}]".format(_xpath_class("cb_desc"))
+_XPATH_EXTRA = ".//p[{}]".format(_xpath_class("courseblockextra"))
+
+# Whitespace that BeautifulSoup collapses (bs4.BeautifulSoup.ASCII_SPACES)
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# Text between tags, where a carriage return is escaped before lxml parses it
+_TEXT = re.compile(r"(^|>)([^<]+)")
+
+def _bs_string(s, preserve):
+    # BeautifulSoup keeps a string of only ASCII whitespace as a single 
+    # newline (if it has one) or space, except inside <pre> and <textarea>
+    if not s:
+        return ""
+    if not preserve and not s.strip(_ASCII_SPACES):
+        return "\n" if "\n" in s else " "
+    return s
+
+def _text_content(element, preserve=False):
+    # Concatenated descendant text, as BeautifulSoup's .text with html.parser; 
+    # comments are skipped but not their tails
+    preserve = preserve or element.tag in ("pre", "textarea")
+    parts = [_bs_string(element.text, preserve)] if isinstance(element.tag, str) else []
+    for child in element:
+        parts.append(_text_content(child, preserve))
+        parts.append(_bs_string(child.tail, preserve))
+    return "".join(parts)
+
+def _iter_lxml(dept_html):
+    # Same records as _course_record, read with lxml and XPath
+    import lxml.html
+
+    if not dept_html.strip():  # lxml rejects empty documents
+        return
+    if "\r" in dept_html:
+        # libxml2 turns "\r\n" into "\n" in text, html.parser keeps it
+        dept_html = _TEXT.sub(lambda match: match.group(1) + match.group(2).replace("\r", "&#13;"), dept_html)
+    try:
+        root = lxml.html.fromstring(dept_html)
+    except ValueError:  # str with an XML encoding declaration
+        root = lxml.html.fromstring(dept_html.encode("utf-8"))
+    coursedescs = root.xpath(_XPATH_COURSEDESCS)
+    if not coursedescs:
+        return
+    for blk in coursedescs[0].xpath(_XPATH_COURSEBLOCK):
+        course_titles = _replace_string(_text_content(blk.xpath(_XPATH_TITLE)[0]))
+        course_id = course_titles.split(".")[0]
+        course_desc = _replace_string(_text_content(blk.xpath(_XPATH_DESC)[0]))
+        prereqs = []
+        for course_prereq_p in blk.xpath(_XPATH_EXTRA):
+            if "Prerequisite" in _text_content(course_prereq_p.xpath(".//strong")[0]):
+                for course_prereq_link in course_prereq_p.xpath(".//a"):
+                    prereqs.append(_replace_string(_text_content(course_prereq_link)))
+        yield {'id': course_id, 'title': course_titles, 'description': course_desc, 'prerequisite': prereqs}
+
+def iter_northeastern_course_info(dept_html, parser=None):
+    """
+    Generator version of `get_northeastern_course_info(dept_html, fast=True)`: 
+    yields the course dictionaries one at a time.
+
+    Only the course descriptions (`div.sc_sccoursedescs`) of the page are 
+    read: with lxml and XPath if lxml is installed, otherwise by building 
+    only that subtree with BeautifulSoup and a SoupStrainer. Only the lxml 
+    path is markedly faster than the default parser. Both give the same 
+    text as the default parser, whitespace and line endings included; 
+    unlike it, they do not require the descriptions to be inside 
+    `div#col-content`.
+
+    Parameters
+    ----------
+        dept_html: str
+            Raw HTML text of a course catalog page for a specific department.
+        parser: str or None
+            "lxml" or "html.parser"; default "lxml" if installed.
+
+    Yields
+    ------
+        course_info : dict
+            {'id': ..., 'title': ..., 'description': ..., 'prerequisite': [...]}
+    """
+
+    if parser is None:
+        parser = _default_parser()
+    if parser == "lxml":
+        yield from _iter_lxml(dept_html)
+        return
+
+    coursedescs_div = _find_coursedescs(dept_html)
+    if coursedescs_div is None:
+        return
+    for blk in coursedescs_div.find_all('div', class_="courseblock"):
+        yield _course_record(blk)
+
 def create_course_prerequisite_network(department_name, courses_info):
 
     """
     Create a network of course prerequisites. Nodes represent courses, edges represent prerequisites.
 
+    Prerequisite cycles (e.g. "Placement in SPNS 1101" listed as a 
+    prerequisite of SPNS 1101 itself) are removed as described in 
+    `PrerequisiteGraph`. To merge several departments, or to update them, use 
+    `PrerequisiteGraph` directly.
+
     Parameters
     ----------
         department_name: str
@@ -93,42 +268,348 @@ def create_course_prerequisite_network(department_name, courses_info):
             Directed network of the course prerequisites.
     """
 
-    df_courses = pd.DataFrame(courses_info)
-    
-    G_prereq = nx.DiGraph()
+    return PrerequisiteGraph().upsert_department(department_name, courses_info).to_networkx()
 
-    # Return empty graph when there is no course (e.g. ESLG)
-    if len(df_courses) == 0:
-        return G_prereq
+def _course_key(course_id):
+    # Order of courses used to break cycles: course number, then the id
+    match = re.search(r"(\d+)\s*$", course_id)
+    return (int(match.group(1)) if match else -1, course_id)
 
+def _iter_bits(bits):
+    # Indices of the set bits of an int, lowest first
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
 
-    all_course_ids = set()
-    all_course_ids.update(set(df_courses['id']))
-    all_course_ids.update(set(itertools.chain.from_iterable(df_courses['prerequisite'])))
-    
-    for course_id in all_course_ids:
-        G_prereq.add_node(course_id,)
-
-    for idx, row in df_courses[['id', 'prerequisite']].iterrows():
-        course_id = row['id']
-        prereq_course_ids = row['prerequisite']
-        for prereq_course_id in prereq_course_ids:
-            # If course j requires course i, there will be a directed edge (i,j)
-            G_prereq.add_edge(prereq_course_id, course_id)
-
-    # Exception for SPNS courses
-    # We could remove all the cycles automatically, but we'll do it manually
-    if department_name == "SPNS":
-        # Remove "Placement in ...." which results in a cycle
-        G_prereq.remove_edge('SPNS 1101','SPNS 1101')
-        G_prereq.remove_edge('SPNS 1102','SPNS 1102')
-        G_prereq.remove_edge('SPNS 2101','SPNS 2101')
-        G_prereq.remove_edge('SPNS 2102','SPNS 2102')
-        G_prereq.remove_edge('SPNS 3101','SPNS 3101')
-        G_prereq.remove_edge('SPNS 3102','SPNS 3102')
-        # SPNS 3603 and SPNS 3602 are cycle in the graph here because this code treats
-        # all the classes listed in the prerequisites section as prerequisites,
-        # even if they are listed as "OR"
-        G_prereq.remove_edge('SPNS 3603','SPNS 3602') 
-    
-    return G_prereq
\ No newline at end of file
+class PrerequisiteGraph:
+    """
+    University-wide course prerequisite network, built department by 
+    department and kept indexed for reachability queries.
+
+    Departments are added or replaced with `upsert_department`, from the 
+    output of `get_northeastern_course_info`. Courses listed as 
+    prerequisites but not (yet) loaded are kept as nodes without a 
+    department. An edge (i, j) means that course i is a prerequisite of 
+    course j, as in `create_course_prerequisite_network`.
+
+    Cycles are removed automatically (remove_cycles=True): self-loops are 
+    dropped, and inside each strongly connected component the edges going 
+    from a higher course number to a lower one are dropped (e.g. 
+    SPNS 3603 -> SPNS 3602, where the catalog lists alternatives ("or") as 
+    prerequisites). The dropped edges are listed in `removed_edges`.
+
+    The index stores, for every course, the set of its transitive 
+    prerequisites as a bitset (a Python int) over the condensation of the 
+    graph (its strongly connected components; single courses once cycles 
+    are removed), its topological level and its predecessor on a longest 
+    prerequisite chain. Upserting a department only recomputes the courses 
+    of the department and the courses that depend on them, in topological 
+    order. Queries then take O(1) (`is_prerequisite`, `level`) or time 
+    proportional to the answer (`prerequisites`, `longest_chain`).
+
+    Parameters
+    ----------
+    remove_cycles : bool, optional (default=True)
+        Remove cycles as described above. With False, the courses of a cycle 
+        are all prerequisites of each other (and of themselves).
+
+    Example
+    -------
+    >>> graph = PrerequisiteGraph()
+    >>> for dept_name, courses_info in catalog.items():
+    ...     graph.upsert_department(dept_name, courses_info)
+    >>> graph.prerequisites("CHME 3312")
+    >>> graph.longest_chain()
+    """
+
+    def __init__(self, remove_cycles=True):
+        self.remove_cycles = remove_cycles
+        self._pred = {}  # course id -> set of listed prerequisites
+        self._succ = {}
+        self._info = {}  # course id -> course record
+        self._department = {}  # course id -> department name
+        self._courses = {}  # department name -> set of course ids
+        self._removed = set()  # edges dropped to break cycles
+
+        # Reachability index
+        self._bit = {}  # course id -> bit position
+        self._ids = {}  # bit position -> course id
+        self._free_bits = []
+        self._ancestors = {}  # course id -> bitset of transitive prerequisites
+        self._level = {}
+        self._chain_pred = {}
+        self._by_level = {}  # level -> set of course ids
+
+    def __len__(self):
+        return len(self._pred)
+
+    def __contains__(self, course_id):
+        return course_id in self._pred
+
+    def _add_node(self, course_id):
+        # Returns True if the course is new
+        if course_id in self._pred:
+            return False
+        self._pred[course_id] = set()
+        self._succ[course_id] = set()
+        bit = self._free_bits.pop() if self._free_bits else len(self._bit)
+        self._bit[course_id] = bit
+        self._ids[bit] = course_id
+        return True
+
+    def _remove_node(self, course_id):
+        self._set_level(course_id, None)
+        del self._pred[course_id], self._succ[course_id]
+        del self._ancestors[course_id], self._chain_pred[course_id]
+        bit = self._bit.pop(course_id)
+        del self._ids[bit]
+        self._free_bits.append(bit)
+
+    def _set_prerequisites(self, course_id, prereqs):
+        # Returns the prerequisites that were dropped
+        dropped = self._pred[course_id] - prereqs
+        for prereq_course_id in dropped:
+            self._succ[prereq_course_id].discard(course_id)
+            self._removed.discard((prereq_course_id, course_id))
+        for prereq_course_id in prereqs:
+            self._succ[prereq_course_id].add(course_id)
+        self._pred[course_id] = prereqs
+        return dropped
+
+    def upsert_department(self, department_name, courses_info):
+        """
+        Add the courses of a department, or replace them if the department 
+        was already added: courses no longer listed are removed, and the 
+        prerequisites of the others are replaced. Returns the graph itself.
+
+        Parameters
+        ----------
+            department_name: str
+                Label for the department, e.g. "CHME".
+            courses_info: list
+                List from get_northeastern_course_info().
+        """
+
+        old_courses = self._courses.pop(department_name, set())
+        new_courses = set()
+        changed = set()  # courses whose prerequisites changed, and new courses
+        dropped = set()  # courses that may no longer be referenced
+
+        for course_info in courses_info or []:
+            course_id = course_info['id']
+            new_courses.add(course_id)
+            if self._add_node(course_id):
+                changed.add(course_id)
+            self._info[course_id] = course_info
+            self._department[course_id] = department_name
+            prereqs = set(course_info['prerequisite'])
+            if prereqs != self._pred[course_id]:
+                for prereq_course_id in prereqs:
+                    if self._add_node(prereq_course_id):
+                        changed.add(prereq_course_id)
+                dropped.update(self._set_prerequisites(course_id, prereqs))
+                changed.add(course_id)
+
+        for course_id in old_courses - new_courses:
+            if self._department.get(course_id) == department_name:
+                del self._department[course_id], self._info[course_id]
+                dropped.update(self._set_prerequisites(course_id, set()))
+                dropped.add(course_id)
+                changed.add(course_id)
+
+        if new_courses:
+            self._courses[department_name] = new_courses
+        self._reindex(changed)
+
+        # Forget the courses that no department lists any more
+        for course_id in dropped:
+            if course_id not in self._department and not self._pred[course_id] and not self._succ[course_id]:
+                self._remove_node(course_id)
+        return self
+
+    def remove_department(self, department_name):
+        """Remove the courses of a department. Returns the graph itself."""
+        return self.upsert_department(department_name, [])
+
+    def _effective_pred(self, course_id):
+        return [p for p in self._pred[course_id] if (p, course_id) not in self._removed]
+
+    def _strongly_connected(self, nodes):
+        # Tarjan's algorithm (iterative) on the subgraph induced by nodes,
+        # ignoring self-loops; components in topological order
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        components = []
+        for root in sorted(nodes, key=_course_key):
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._succ[root]))]
+            while work:
+                v, successors = work[-1]
+                for w in successors:
+                    if w == v or w not in nodes:
+                        continue
+                    if w not in index:
+                        index[w] = low[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(self._succ[w])))
+                        break
+                    if w in on_stack:
+                        low[v] = min(low[v], index[w])
+                else:
+                    work.pop()
+                    if work:
+                        u = work[-1][0]
+                        low[u] = min(low[u], low[v])
+                    if low[v] == index[v]:
+                        component = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            component.append(w)
+                            if w == v:
+                                break
+                        components.append(component)
+        components.reverse()
+        return components
+
+    def _condensation(self, nodes):
+        # Components of the affected courses in topological order, after
+        # removing cycles if requested
+        for component in self._strongly_connected(nodes):
+            component.sort(key=_course_key)
+            if not self.remove_cycles:
+                yield component
+                continue
+            members = set(component)
+            for course_id in component:
+                for prereq_course_id in self._pred[course_id]:
+                    if prereq_course_id == course_id or (prereq_course_id in members and _course_key(prereq_course_id) > _course_key(course_id)):
+                        self._removed.add((prereq_course_id, course_id))
+            # The remaining edges go from lower to higher course numbers
+            for course_id in component:
+                yield [course_id]
+
+    def _set_level(self, course_id, level):
+        old_level = self._level.pop(course_id, None)
+        if old_level is not None:
+            self._by_level[old_level].discard(course_id)
+            if not self._by_level[old_level]:
+                del self._by_level[old_level]
+        if level is not None:
+            self._level[course_id] = level
+            self._by_level.setdefault(level, set()).add(course_id)
+
+    def _reindex(self, changed):
+        # Only the changed courses and the courses that (transitively) list 
+        # them as prerequisites need to be updated
+        affected = set(changed)
+        queue = deque(affected)
+        while queue:
+            for successor in self._succ[queue.popleft()]:
+                if successor not in affected:
+                    affected.add(successor)
+                    queue.append(successor)
+        # A cycle through an affected course only contains affected courses
+        self._removed = {edge for edge in self._removed if edge[1] not in affected}
+
+        for component in self._condensation(affected):
+            members = set(component)
+            ancestors = 0
+            level, chain_pred = 0, None
+            for course_id in component:
+                for prereq_course_id in self._effective_pred(course_id):
+                    if prereq_course_id in members:
+                        continue
+                    ancestors |= self._ancestors[prereq_course_id] | (1 << self._bit[prereq_course_id])
+                    prereq_level = self._level[prereq_course_id] + 1
+                    if prereq_level > level or (prereq_level == level and _course_key(prereq_course_id) < _course_key(chain_pred)):
+                        level, chain_pred = prereq_level, prereq_course_id
+            cyclic = len(component) > 1 or component[0] in self._effective_pred(component[0])
+            if cyclic:
+                for course_id in component:
+                    ancestors |= 1 << self._bit[course_id]
+            for course_id in component:
+                self._ancestors[course_id] = ancestors
+                self._chain_pred[course_id] = chain_pred
+                self._set_level(course_id, level)
+
+    def _check(self, course_id):
+        if course_id not in self._pred:
+            raise ValueError("{} is not in the prerequisite graph".format(course_id))
+
+    def prerequisites(self, course_id, transitive=True):
+        """
+        Prerequisites of a course, sorted by course number: all courses 
+        required before it (transitive=True), or only the ones it lists.
+        """
+        self._check(course_id)
+        if transitive:
+            prereqs = [self._ids[bit] for bit in _iter_bits(self._ancestors[course_id])]
+        else:
+            prereqs = self._effective_pred(course_id)
+        return sorted(prereqs, key=_course_key)
+
+    def is_prerequisite(self, prereq_course_id, course_id):
+        """Whether prereq_course_id is required (transitively) before course_id."""
+        self._check(prereq_course_id)
+        self._check(course_id)
+        return bool(self._ancestors[course_id] >> self._bit[prereq_course_id] & 1)
+
+    def level(self, course_id):
+        """
+        Topological level of a course: 0 without prerequisites, otherwise 
+        1 + the highest level of its prerequisites, i.e. the number of 
+        courses on its longest prerequisite chain, minus one.
+        """
+        self._check(course_id)
+        return self._level[course_id]
+
+    def longest_chain(self, course_id=None):
+        """
+        Longest prerequisite chain ending at a course, as a list of course 
+        ids from the first course to `course_id`. Default: a longest chain 
+        of the whole graph.
+        """
+        if course_id is None:
+            if not self._by_level:
+                return []
+            course_id = min(self._by_level[max(self._by_level)], key=_course_key)
+        self._check(course_id)
+        chain = [course_id]
+        while self._chain_pred[chain[-1]] is not None:
+            chain.append(self._chain_pred[chain[-1]])
+        return chain[::-1]
+
+    @property
+    def removed_edges(self):
+        """Edges (prerequisite, course) removed to break cycles."""
+        return sorted(self._removed, key=lambda edge: (_course_key(edge[1]), _course_key(edge[0])))
+
+    def department(self, course_id):
+        """Department of a course, or None for a course that is only listed as a prerequisite."""
+        self._check(course_id)
+        return self._department.get(course_id)
+
+    def to_networkx(self):
+        """
+        The prerequisite network as a networkx.DiGraph, without the removed 
+        edges. Courses of loaded departments have `department` and `title` 
+        node attributes.
+        """
+        G_prereq = nx.DiGraph()
+        for course_id in sorted(self._pred, key=_course_key):
+            if course_id in self._info:
+                G_prereq.add_node(course_id, department=self._department[course_id], title=self._info[course_id]['title'])
+            else:
+                G_prereq.add_node(course_id)
+        for course_id in self._pred:
+            for prereq_course_id in self._effective_pred(course_id):
+                # If course j requires course i, there will be a directed edge (i,j)
+                G_prereq.add_edge(prereq_course_id, course_id)
+        return G_prereq
@@ -0,0 +1,47 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import netscitools
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(netscitools.__file__)))
+HEAVY = ["numpy", "networkx", "bs4", "lxml"]
+
+
+def run(statement):
+    # Run `statement` in a fresh interpreter; return the heavy modules loaded
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+    code = "import json, sys\n{}\nprint(json.dumps([name for name in {!r} if sys.modules.get(name) is not None]))".format(statement, HEAVY)
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    assert process.returncode == 0, process.stderr
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def test_import_is_lazy():
+    assert run("import netscitools") == []
+    assert run("from netscitools import compare_decimal_places") == []
+    assert "networkx" in run("from netscitools import degree_distribution")
+
+
+def test_star_import_without_scraping_extra():
+    # As on an install without the "scraping" extra: bs4 and lxml cannot be imported
+    loaded = run(
+        "sys.modules.update(dict.fromkeys(['bs4', 'lxml', 'lxml.html']))\n"
+        "from netscitools import *\n"
+        "assert PrerequisiteGraph and fetch_northeastern_catalog and get_northeastern_course_info"
+    )
+    assert "numpy" in loaded and "networkx" in loaded
+
+
+@pytest.mark.parametrize("submodule", netscitools._SUBMODULES)
+def test_exports_match_submodules(submodule):
+    module = importlib.import_module("netscitools." + submodule)
+    exported = [name for name, source in netscitools._EXPORTS.items() if source == submodule]
+    assert sorted(exported) == sorted(module.__all__)
+    for name in exported:
+        assert getattr(netscitools, name) is getattr(module, name)
+    assert set(netscitools._EXPORTS.values()) <= set(netscitools._SUBMODULES)
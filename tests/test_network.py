@@ -0,0 +1,109 @@
+import warnings
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from netscitools import network
+from netscitools.csr import CSRGraph
+from netscitools.network import edgelist_degrees, network_metrics
+
+
+def test_metrics_cache():
+    G = nx.gnp_random_graph(100, 0.1, seed=0)
+    assert network_metrics(G, metrics=["size"], cache=True)["number_of_nodes"] == 100
+    assert G not in network._metrics_cache  # cheap metrics are not cached
+
+    transitivity = network_metrics(G, cache=True)["transitivity"]
+    assert network_metrics(G, cache=True)["transitivity"] == transitivity
+    # Rewire in place, keeping the number of edges
+    nx.double_edge_swap(G, nswap=20, seed=0)
+    assert nx.transitivity(G) != transitivity
+    assert network_metrics(G, cache=True)["transitivity"] == nx.transitivity(G)
+
+    C = CSRGraph.from_networkx(G)
+    result = network_metrics(C, cache=True)
+    assert network._metrics_cache[C][0] is None  # read-only: no fingerprint
+    assert network_metrics(C, cache=True) == result
+
+
+def test_traversal_sources():
+    G = nx.Graph([("ab", "cd"), ("cd", "a"), ("a", "b"), ("x", "y")])
+    # A string is one node, even when its characters are nodes too
+    assert [node for node, _ in network.iter_bfs(G, "ab")] == ["ab", "cd", "a", "b"]
+    assert dict(network.iter_dfs(G, "ab")) == {"ab": 0, "cd": 1, "a": 2, "b": 3}
+    assert dict(network.iter_bfs(G, ["ab", "x"])) == {"ab": 0, "x": 0, "cd": 1, "y": 1, "a": 2, "b": 3}
+    with pytest.raises(nx.NodeNotFound, match="'abc'"):
+        list(network.iter_bfs(G, "abc"))
+    with pytest.raises(nx.NodeNotFound, match="'z'"):
+        list(network.iter_dfs(G, ["ab", "z"]))
+
+
+def exact_path_lengths(G):
+    counts = {}
+    for _, lengths in nx.all_pairs_shortest_path_length(G):
+        for length in lengths.values():
+            if length:
+                counts[length] = counts.get(length, 0) + 1
+    return [counts.get(length, 0) for length in range(1, max(counts) + 1)]
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+@pytest.mark.parametrize("directed", [False, True])
+def test_path_length_distribution(directed, n_jobs):
+    G = nx.gnp_random_graph(120, 0.03, seed=0, directed=directed)
+    G.add_nodes_from(["isolated", "other"])  # unreachable pairs are not counted
+    expected = exact_path_lengths(G)
+    for graph in (G, CSRGraph.from_networkx(G)):
+        bins, hist, error = network.path_length_distribution(
+            graph, density=False, batch_size=16, n_jobs=n_jobs, return_error=True
+        )
+        assert bins.tolist() == list(range(1, len(expected) + 1))
+        assert hist.tolist() == expected
+        assert error["exact"] and error["n_sources"] == 122 and error["diameter"] == len(expected)
+        assert error["mean_stderr"] == 0 and not error["hist_stderr"].any()
+
+    _, density = network.path_length_distribution(G, batch_size=16, n_jobs=n_jobs)
+    assert density == pytest.approx([count / sum(expected) for count in expected])
+
+
+def test_path_length_distribution_sampling():
+    G = nx.connected_watts_strogatz_graph(400, 6, 0.1, seed=0)
+    _, _, exact = network.path_length_distribution(G, n_jobs=1, return_error=True)
+    bins, hist, error = network.path_length_distribution(G, n_sources=80, n_jobs=1, seed=0, return_error=True)
+    assert not error["exact"] and error["n_sources"] == 80
+    assert error["mean_stderr"] > 0 and len(error["hist_stderr"]) == len(bins)
+    assert abs(error["mean"] - exact["mean"]) < 4 * error["mean_stderr"]
+    assert error["mean_ci95"][0] < error["mean"] < error["mean_ci95"][1]
+    assert hist.sum() == pytest.approx(1.0) and len(bins) <= exact["diameter"]
+    # Same seed, same sample
+    assert network.path_length_distribution(G, n_sources=80, n_jobs=1, seed=0)[1].tolist() == hist.tolist()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_edgelist_text_matches_binary(tmp_path, chunk_size):
+    G = nx.gnm_random_graph(300, 1500, seed=0, directed=True)
+    edges = np.array(G.edges(), dtype=np.int64)
+    edges.tofile(str(tmp_path / "edges.bin"))
+    lines = ["{} {}".format(u, v) for u, v in edges]
+    # Comment-only stretches longer than a block, blank lines, padding and 
+    # no newline at the end
+    lines[10:10] = ["# comment {}".format(i) for i in range(50)]
+    lines[100:100] = ["", "  ", "\t{}\t{}  ".format(*edges[0]), "% other"]
+    (tmp_path / "edges.txt").write_text("\n".join(lines))
+    expected = edgelist_degrees(str(tmp_path / "edges.bin"), binary=True, chunk_size=chunk_size)
+    text = str(tmp_path / "edges.txt")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        degrees = edgelist_degrees(text, comments=["#", "%"], chunk_size=chunk_size)
+    degrees[edges[0]] -= 1  # the padded line repeats edge 0
+    assert degrees.tolist() == expected.tolist()
+
+    # Weight columns and a delimiter
+    (tmp_path / "weighted.csv").write_text("".join("{},{},0.5\n".format(u, v) for u, v in edges))
+    degrees = edgelist_degrees(str(tmp_path / "weighted.csv"), delimiter=",", chunk_size=chunk_size)
+    assert degrees.tolist() == expected.tolist()
+
+    (tmp_path / "bad.txt").write_text("1 2\n3\n")
+    with pytest.raises(ValueError):
+        edgelist_degrees(str(tmp_path / "bad.txt"), chunk_size=chunk_size)
@@ -0,0 +1,118 @@
+import gc
+import glob
+import hashlib
+import os
+import threading
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("bs4")
+
+from netscitools.neu_catalog import fetch_northeastern_catalog
+from netscitools.neu_courses import get_northeastern_course_info
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "catalog")
+
+# A course block without a title: the parser fails on it
+BAD_PAGE = '<div id="col-content"><div class="sc_sccoursedescs"><div class="courseblock"></div></div></div>'
+
+
+class CatalogHandler(BaseHTTPRequestHandler):
+    # Stand-in for catalog.northeastern.edu: serves `pages` (path -> bytes)
+    # with an ETag, answers If-None-Match with 304 and unknown paths with 404
+    protocol_version = "HTTP/1.1"
+    pages = {}
+    requests = []
+
+    def do_GET(self):
+        content = self.pages.get(self.path)
+        if content is None:
+            status, body, etag = 404, b"not found", None
+        else:
+            etag = '"{}"'.format(hashlib.sha1(content).hexdigest())
+            status, body = (304, b"") if self.headers.get("If-None-Match") == etag else (200, content)
+        self.requests.append((self.path, status))
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    pages = {}
+    for path in glob.glob(os.path.join(FIXTURES, "*.html")):
+        with open(path, "rb") as f:
+            pages["/course-descriptions/{}/".format(os.path.basename(path)[:-5])] = f.read()
+    pages["/course-descriptions/bad/"] = BAD_PAGE.encode()
+    departments = sorted(path.split("/")[2] for path in pages) + ["nope"]
+    pages["/course-descriptions/"] = "".join(
+        '<a href="/course-descriptions/{}/">{}</a>'.format(code, code.upper()) for code in departments
+    ).encode()
+
+    handler = type("Handler", (CatalogHandler,), {"pages": pages, "requests": []})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield handler, "http://127.0.0.1:{}/course-descriptions/".format(httpd.server_address[1])
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def expected_courses(code):
+    with open(os.path.join(FIXTURES, code + ".html"), encoding="utf-8") as f:
+        return get_northeastern_course_info(f.read())
+
+
+def fetch(base_url, cache_dir):
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        catalog, stats = fetch_northeastern_catalog(
+            cache_dir=str(cache_dir), base_url=base_url, max_workers=4, parse_workers=2, return_stats=True
+        )
+        gc.collect()
+    return catalog, stats, caught
+
+
+def test_fetch_revalidate_and_errors(server, tmp_path):
+    handler, base_url = server
+
+    catalog, stats, caught = fetch(base_url, tmp_path)
+    assert list(catalog) == ["CHME", "MATH", "SPNS"]
+    for code in catalog:
+        assert catalog[code] == expected_courses(code.lower())
+    assert stats["downloaded"] == 4 and stats["not_modified"] == 0
+    assert stats["parsed"] == 3 and stats["parse_cached"] == 0
+    # A 404 and a page that fails to parse are reported, not raised
+    assert set(stats["errors"]) == {"NOPE", "BAD"}
+    assert "404" in stats["errors"]["NOPE"]
+    messages = [str(warning.message) for warning in caught]
+    assert any("could not fetch NOPE" in message for message in messages)
+    assert any("could not parse BAD" in message for message in messages)
+    # Keep-alive connections are closed
+    assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
+
+    # Second run: every page is revalidated (304) and nothing is parsed again
+    handler.requests.clear()
+    catalog_again, stats, caught = fetch(base_url, tmp_path)
+    assert catalog_again == catalog
+    assert stats["downloaded"] == 0 and stats["not_modified"] == 4
+    assert stats["parse_cached"] == 3 and stats["parsed"] == 0
+    assert set(stats["errors"]) == {"NOPE", "BAD"}
+    assert {status for path, status in handler.requests if path != "/course-descriptions/nope/"} == {304}
+
+    # A changed page is downloaded and parsed again, the others are not
+    path = "/course-descriptions/chme/"
+    handler.pages[path] = handler.pages[path].replace(b"courseblocktitle", b"courseblocktitle extra")
+    _, stats, _ = fetch(base_url, tmp_path)
+    assert stats["downloaded"] == 1 and stats["parsed"] == 1 and stats["parse_cached"] == 2
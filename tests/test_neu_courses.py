@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("bs4")
+
+from netscitools import neu_courses
+from netscitools.neu_courses import get_northeastern_course_info, iter_northeastern_course_info
+
+PARSERS = ["html.parser"] + (["lxml"] if neu_courses._has_lxml() else [])
+
+COURSEBLOCK = (
+    '<div class="courseblock">\n'
+    '<p class="courseblocktitle">\n  <strong>X\xa01. Topics <!-- note -->in X.  (4 Hours)</strong></p>\n'
+    '<p class="cb_desc">Line one\r\nline two <em> </em>\t<em>\r\n</em> end.</p>\n'
+    '<p class="courseblockextra noindent"><strong>Prerequisite(s):</strong> <a href="/x0"> X 0</a> or\r\n<a>X\xa02</a></p>\n'
+    '<p class="courseblockextra"><strong>Corequisite(s):</strong> <a>X 3</a></p>\n'
+    '</div>\n'
+)
+PAGE = '<div id="col-content"><div class="sc_sccoursedescs">\r\n' + COURSEBLOCK * 2 + '</div></div>'
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_fast_parsers_match_default(parser):
+    expected = get_northeastern_course_info(PAGE)
+    assert expected[0] == {
+        'id': '\nX 1', 'title': '\nX 1. Topics in X.  (4 Hours)',
+        'description': 'Line one\r\nline two   \n end.', 'prerequisite': [' X 0', 'X 2'],
+    }
+    assert list(iter_northeastern_course_info(PAGE, parser=parser)) == expected
+
+    # The fast parsers do not require div#col-content, the default does
+    page = PAGE.replace('id="col-content"', 'id="main"')
+    with pytest.raises(AttributeError):
+        get_northeastern_course_info(page)
+    assert list(iter_northeastern_course_info(page, parser=parser)) == expected
+
+    assert list(iter_northeastern_course_info("", parser=parser)) == []
+
+
+def test_cache_key_includes_parser(monkeypatch):
+    neu_courses._parse_cache.clear()
+    expected = get_northeastern_course_info(PAGE)
+    for has_lxml in [True, False] if "lxml" in PARSERS else [False]:
+        monkeypatch.setattr(neu_courses, "_has_lxml", lambda: has_lxml)
+        assert get_northeastern_course_info(PAGE, fast=True, cache=True) == expected
+        assert get_northeastern_course_info(PAGE, fast=True, cache=True) == expected
+    assert get_northeastern_course_info(PAGE, cache=True) == expected
+    suffixes = sorted(key[40:] for key in neu_courses._parse_cache)
+    assert suffixes == sorted([""] + ["-fast-" + parser for parser in PARSERS])
+    neu_courses._parse_cache.clear()
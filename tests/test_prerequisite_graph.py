@@ -0,0 +1,110 @@
+import random
+
+import networkx as nx
+import pytest
+
+from netscitools.neu_courses import PrerequisiteGraph, create_course_prerequisite_network
+
+
+def course(course_id, *prereqs):
+    return {'id': course_id, 'title': course_id + ".  Title.  (4 Hours)", 'description': '', 'prerequisite': list(prereqs)}
+
+
+def rebuild(departments, remove_cycles):
+    graph = PrerequisiteGraph(remove_cycles=remove_cycles)
+    for department_name, courses_info in departments.items():
+        graph.upsert_department(department_name, courses_info)
+    return graph
+
+
+def assert_same_index(graph, expected):
+    G = graph.to_networkx()
+    assert set(G) == set(expected.to_networkx())
+    assert set(G.edges()) == set(expected.to_networkx().edges())
+    assert graph.removed_edges == expected.removed_edges
+    assert graph.longest_chain() == expected.longest_chain()
+    for course_id in G:
+        assert graph.prerequisites(course_id) == expected.prerequisites(course_id)
+        assert graph.level(course_id) == expected.level(course_id)
+        assert graph.longest_chain(course_id) == expected.longest_chain(course_id)
+
+
+def assert_matches_networkx(graph):
+    G = graph.to_networkx()
+    in_cycle = {course_id for component in nx.strongly_connected_components(G) if len(component) > 1 for course_id in component}
+    in_cycle.update(u for u, _ in nx.selfloop_edges(G))
+    if graph.remove_cycles:
+        assert not in_cycle
+    for course_id in G:
+        ancestors = nx.ancestors(G, course_id) | ({course_id} if course_id in in_cycle else set())
+        assert set(graph.prerequisites(course_id)) == ancestors
+        assert all(graph.is_prerequisite(other, course_id) == (other in ancestors) for other in G)
+        if graph.remove_cycles:
+            chain = graph.longest_chain(course_id)
+            assert chain[-1] == course_id and all(G.has_edge(u, v) for u, v in zip(chain, chain[1:]))
+            assert len(chain) - 1 == graph.level(course_id) == nx.dag_longest_path_length(G.subgraph(ancestors | {course_id}))
+
+
+def test_cycles_are_removed():
+    courses_info = [
+        course("SPNS 1101", "SPNS 1101"),
+        course("SPNS 1102", "SPNS 1101", "SPNS 1102"),
+        course("SPNS 3602", "SPNS 1102", "SPNS 3603"),
+        course("SPNS 3603", "SPNS 3602"),
+    ]
+    graph = PrerequisiteGraph().upsert_department("SPNS", courses_info)
+    assert graph.removed_edges == [("SPNS 1101", "SPNS 1101"), ("SPNS 1102", "SPNS 1102"), ("SPNS 3603", "SPNS 3602")]
+    assert graph.prerequisites("SPNS 3603") == ["SPNS 1101", "SPNS 1102", "SPNS 3602"]
+    assert graph.longest_chain() == ["SPNS 1101", "SPNS 1102", "SPNS 3602", "SPNS 3603"]
+    assert graph.level("SPNS 1101") == 0 and graph.level("SPNS 3603") == 3
+    assert set(create_course_prerequisite_network("SPNS", courses_info).edges()) == set(graph.to_networkx().edges())
+
+    kept = PrerequisiteGraph(remove_cycles=False).upsert_department("SPNS", courses_info)
+    assert kept.removed_edges == []
+    assert kept.prerequisites("SPNS 3602") == ["SPNS 1101", "SPNS 1102", "SPNS 3602", "SPNS 3603"]
+
+
+def test_courses_across_departments():
+    graph = PrerequisiteGraph()
+    graph.upsert_department("CHME", [course("CHME 2310", "MATH 1341"), course("CHME 3312", "CHME 2310")])
+    # MATH 1341 is known only as a prerequisite until MATH is added
+    assert graph.department("MATH 1341") is None
+    graph.upsert_department("MATH", [course("MATH 1341", "MATH 1241"), course("MATH 1241")])
+    assert graph.department("MATH 1341") == "MATH"
+    assert graph.prerequisites("CHME 3312") == ["MATH 1241", "MATH 1341", "CHME 2310"]
+    assert graph.prerequisites("CHME 3312", transitive=False) == ["CHME 2310"]
+    assert graph.longest_chain() == ["MATH 1241", "MATH 1341", "CHME 2310", "CHME 3312"]
+
+    graph.remove_department("MATH")
+    assert "MATH 1241" not in graph
+    assert graph.department("MATH 1341") is None
+    assert graph.prerequisites("CHME 3312") == ["MATH 1341", "CHME 2310"]
+    with pytest.raises(ValueError):
+        graph.prerequisites("MATH 1241")
+
+
+@pytest.mark.parametrize("remove_cycles", [True, False])
+def test_incremental_matches_rebuild(remove_cycles):
+    rng = random.Random(0)
+    codes = ["A", "B", "C"]
+    for _ in range(30):
+        graph = PrerequisiteGraph(remove_cycles=remove_cycles)
+        departments = {}
+        for _ in range(8):
+            code = rng.choice(codes)
+            if rng.random() < 0.15:
+                departments.pop(code, None)
+                graph.remove_department(code)
+            else:
+                departments[code] = [
+                    course("{} {}".format(code, 1000 + number), *(
+                        "{} {}".format(rng.choice(codes), 1000 + rng.randint(1, 14)) for _ in range(rng.randint(0, 3))
+                    ))
+                    for number in rng.sample(range(1, 15), rng.randint(0, 6))
+                ]
+                graph.upsert_department(code, departments[code])
+            assert_same_index(graph, rebuild(departments, remove_cycles))
+            assert_matches_networkx(graph)
+        for code in codes:
+            graph.remove_department(code)
+        assert len(graph) == 0 and graph.longest_chain() == []
@@ -0,0 +1,92 @@
+import networkx as nx
+import pytest
+
+from netscitools.csr import CSRGraph
+from netscitools.network import EdgeSwapRandomizer, degree_preserving_randomization
+
+
+def graphs():
+    yield nx.barabasi_albert_graph(200, 3, seed=0)
+    yield nx.gnp_random_graph(150, 0.05, seed=0, directed=True)
+    yield CSRGraph.from_networkx(nx.barabasi_albert_graph(200, 3, seed=1))
+
+
+@pytest.mark.parametrize("G", list(graphs()), ids=["undirected", "directed", "csr"])
+def test_degrees_are_preserved(G):
+    randomizer = EdgeSwapRandomizer(G, seed=0).run(10 * G.number_of_edges())
+    result = randomizer.to_networkx()
+    H = G.to_networkx() if isinstance(G, CSRGraph) else G
+    R = result.to_networkx() if isinstance(result, CSRGraph) else result
+    assert randomizer.stats.accepted > G.number_of_edges()
+    assert R.number_of_edges() == H.number_of_edges() and nx.number_of_selfloops(R) == 0
+    if H.is_directed():
+        assert dict(R.in_degree()) == dict(H.in_degree())
+        assert dict(R.out_degree()) == dict(H.out_degree())
+    else:
+        assert dict(R.degree()) == dict(H.degree())
+
+    # stats.overlap is the fraction of the original edges still present
+    original = {frozenset(edge) if not H.is_directed() else edge for edge in H.edges()}
+    current = {frozenset(edge) if not H.is_directed() else edge for edge in R.edges()}
+    assert randomizer.stats.overlap == len(original & current) / len(original)
+    assert randomizer.stats.overlap < 0.5
+
+
+def test_same_seed_same_result():
+    G = nx.barabasi_albert_graph(200, 3, seed=0)
+    first = EdgeSwapRandomizer(G, seed=7).run(3000)
+    # Splitting the iterations between runs draws the same swaps
+    second = EdgeSwapRandomizer(G, seed=7).run(1000).run(1234).run(766)
+    other = EdgeSwapRandomizer(G, seed=8).run(3000)
+    assert set(first.to_networkx().edges()) == set(second.to_networkx().edges())
+    assert (first.stats.accepted, first.stats.overlap) == (second.stats.accepted, second.stats.overlap)
+    assert set(first.to_networkx().edges()) != set(other.to_networkx().edges())
+
+
+def test_trace_ends_on_current_transitivity():
+    G = nx.powerlaw_cluster_graph(200, 3, 0.5, seed=0)
+    M = G.number_of_edges()
+    randomizer = EdgeSwapRandomizer(G, seed=0, track_triangles=True)
+    # Ends off the trace interval, then on it
+    randomizer.run(M + 17, trace_interval=M // 4)
+    assert randomizer.trace[0] == (0, nx.transitivity(G))
+    assert randomizer.trace[-1] == (M + 17, nx.transitivity(randomizer.to_networkx()))
+    interval = M // 4
+    randomizer.run(interval - randomizer.n_iter % interval, trace_interval=interval)
+    assert randomizer.n_iter % interval == 0
+    assert randomizer.trace[-1][1] == nx.transitivity(randomizer.to_networkx())
+    iterations = [iteration for iteration, _ in randomizer.trace]
+    assert iterations == sorted(set(iterations)) and iterations[-1] == randomizer.n_iter
+
+
+def test_early_stop():
+    G = nx.barabasi_albert_graph(300, 3, seed=0)
+    M = G.number_of_edges()
+    checks = []
+    randomizer = EdgeSwapRandomizer(G, seed=0).run(1000 * M, early_stop=True, callback=checks.append)
+    assert randomizer.stats.converged
+    assert randomizer.n_iter < 20 * M and randomizer.n_iter % M == 0
+    assert len(checks) == randomizer.n_iter // M
+    # A run too short to converge clears the flag
+    randomizer.run(M // 2, early_stop=True)
+    assert not randomizer.stats.converged
+
+
+def test_early_stop_on_dense_graph():
+    # Most attempts are rejected on a dense graph: the run must not stop 
+    # until the overlap has settled in terms of accepted swaps
+    G = nx.gnp_random_graph(60, 0.9, seed=1)
+    M = G.number_of_edges()
+    randomizer = EdgeSwapRandomizer(G, seed=0).run(1000 * M, early_stop=True)
+    assert randomizer.stats.converged
+    assert randomizer.stats.accepted >= 2 * M
+    reference = EdgeSwapRandomizer(G, seed=1).run(200 * M).stats.overlap
+    assert abs(randomizer.stats.overlap - reference) < 0.01
+
+
+def test_unknown_engine():
+    G = nx.barabasi_albert_graph(50, 2, seed=0)
+    # Rejected whatever the routing: plain, instrumented or CSR input
+    for graph, options in [(G, {}), (G, {"return_stats": True}), (CSRGraph.from_networkx(G), {})]:
+        with pytest.raises(ValueError, match="bogus"):
+            degree_preserving_randomization(graph, engine="bogus", **options)